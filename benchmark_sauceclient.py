@@ -0,0 +1,547 @@
+#!/usr/bin/env python3
+
+"""Offline benchmarks for sauceclient.
+
+The client is run against `MockSauceServer`, a local stand-in for the Sauce
+Labs REST API with configurable latency, payload sizes, rate limiting and
+server errors, so no network access or Sauce account is needed. Results are
+written as JSON, and can be compared against a saved baseline to catch
+performance regressions:
+
+    python benchmark_sauceclient.py --output baseline.json
+    python benchmark_sauceclient.py --baseline baseline.json
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import platform
+import random
+import re
+import ssl
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import sauceclient
+
+USERNAME = "bench-user"
+
+
+class MockSauceHandler(BaseHTTPRequestHandler):
+    """Request handler emulating the Sauce REST endpoints used by the
+    benchmarks.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, which would otherwise add
+    # delayed ACK stalls to every response
+    disable_nagle_algorithm = True
+
+    routes = (
+        ("GET", r"/rest/v1/info/status", "get_status"),
+        ("GET", r"/rest/v1/[^/]+/jobs", "get_jobs"),
+        ("GET", r"/rest/v1/[^/]+/jobs/([^/]+)", "get_job"),
+        ("PUT", r"/rest/v1/[^/]+/jobs/([^/]+)", "update_job"),
+        ("GET", r"/rest/v1/[^/]+/jobs/([^/]+)/assets/([^/]+)", "get_asset"),
+        ("POST", r"/rest/v1/storage/[^/]+/([^/]+)", "upload_file"),
+    )
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch()
+
+    def do_PUT(self):
+        self.dispatch()
+
+    def do_POST(self):
+        self.dispatch()
+
+    def dispatch(self):
+        url = urlsplit(self.path)
+        self.query = parse_qs(url.query)
+        length = int(self.headers.get("Content-Length", 0))
+        md5 = hashlib.md5()
+        body = bytearray()
+        remaining = length
+        while remaining:
+            chunk = self.rfile.read(min(remaining, sauceclient.CHUNK_SIZE))
+            if not chunk:
+                break
+            md5.update(chunk)
+            if self.command != "POST":
+                # uploads are only hashed, other bodies are decoded as json
+                body += chunk
+            remaining -= len(chunk)
+        self.body = bytes(body)
+        if self.headers.get("Content-Encoding") == "gzip" and self.body:
+            self.body = gzip.decompress(self.body)
+        self.body_md5 = md5.hexdigest()
+        self.body_length = length
+        fault = self.server.next_fault()
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if fault == 429:
+            self.send_json({"message": "Too Many Requests"}, 429, {"Retry-After": "0"})
+            return
+        if fault == 500:
+            self.send_json({"message": "Internal Server Error"}, 500)
+            return
+        for method, pattern, name in self.routes:
+            match = re.fullmatch(pattern, url.path)
+            if match and method == self.command:
+                getattr(self, name)(*match.groups())
+                return
+        self.send_json({"message": "Not Found"}, 404)
+
+    def send_json(self, data, status=200, headers=None):
+        self.send_data(json.dumps(data).encode("utf-8"), status, headers)
+
+    def send_data(self, data, status=200, headers=None):
+        if (
+            self.server.compress
+            and len(data) > 1024
+            and "gzip" in self.headers.get("Accept-Encoding", "")
+        ):
+            data = gzip.compress(data, compresslevel=1)
+            headers = {**(headers or {}), "Content-Encoding": "gzip"}
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def get_status(self):
+        self.send_json(
+            {
+                "wait_time": 0.5,
+                "service_operational": True,
+                "status_message": "Basic service status checks passed.",
+            }
+        )
+
+    def get_jobs(self):
+        limit = int(self.query.get("limit", ["100"])[0])
+        skip = int(self.query.get("skip", ["0"])[0])
+        stop = min(skip + limit, self.server.jobs)
+        self.send_json([self.server.make_job(i) for i in range(skip, stop)])
+
+    def get_job(self, job_id):
+        self.send_json(self.server.make_job(job_id))
+
+    def update_job(self, job_id):
+        self.send_json({**self.server.make_job(job_id), **json.loads(self.body)})
+
+    def get_asset(self, job_id, filename):
+        size = self.server.asset_size
+        start = 0
+        status = 200
+        headers = {}
+        match = re.fullmatch(r"bytes=(\d+)-", self.headers.get("Range", ""))
+        if match:
+            start = int(match.group(1))
+            if start >= size:
+                self.send_data(b"", 416)
+                return
+            status = 206
+            headers["Content-Range"] = f"bytes {start}-{size - 1}/{size}"
+        self.send_response(status)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(size - start))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        block = b"\0" * sauceclient.CHUNK_SIZE
+        remaining = size - start
+        while remaining:
+            self.wfile.write(block[:remaining])
+            remaining -= min(remaining, len(block))
+
+    def upload_file(self, filename):
+        self.send_json(
+            {
+                "username": USERNAME,
+                "filename": filename,
+                "size": self.body_length,
+                "md5": self.body_md5,
+                "etag": self.body_md5,
+            }
+        )
+
+
+class MockSauceServer(ThreadingHTTPServer):
+    """Local stand-in for the Sauce Labs REST API.
+
+    Every response is delayed by `latency` seconds. Job records are padded
+    to roughly `payload_size` bytes, job listings hold `jobs` records, and
+    job assets are `asset_size` bytes. Every `throttle_every`th request is
+    answered with a 429, and a random `error_rate` fraction of the others
+    with a 500. With `compress`, JSON responses are gzipped for clients
+    accepting it. With a `certfile`, the server speaks HTTPS.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        address=("127.0.0.1", 0),
+        latency=0.0,
+        payload_size=512,
+        jobs=1000,
+        asset_size=1024 * 1024,
+        throttle_every=0,
+        error_rate=0.0,
+        compress=True,
+        certfile=None,
+        keyfile=None,
+        seed=0,
+    ):
+        """Initialize class."""
+        super().__init__(address, MockSauceHandler)
+        self.latency = latency
+        self.payload_size = payload_size
+        self.jobs = jobs
+        self.asset_size = asset_size
+        self.throttle_every = throttle_every
+        self.error_rate = error_rate
+        self.compress = compress
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        if certfile is not None:
+            context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            context.load_cert_chain(certfile, keyfile)
+            self.socket = context.wrap_socket(self.socket, server_side=True)
+        self.scheme = "http" if certfile is None else "https"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+    @property
+    def apibase(self):
+        """`apibase` for a `SauceClient` talking to this server."""
+        host, port = self.server_address[:2]
+        return f"{self.scheme}://{host}:{port}"
+
+    def next_fault(self):
+        """Count a request, and get the error status to answer it with, if
+        any.
+        """
+        with self._lock:
+            self.requests += 1
+            if self.throttle_every and self.requests % self.throttle_every == 0:
+                return 429
+            if self.error_rate and self._random.random() < self.error_rate:
+                return 500
+        return None
+
+    def make_job(self, job_id):
+        """Create a job record padded to about `payload_size` bytes."""
+        return {
+            "id": f"{job_id:032x}" if isinstance(job_id, int) else job_id,
+            "owner": USERNAME,
+            "status": "complete",
+            "passed": True,
+            "name": "benchmark job",
+            "browser": "chrome",
+            "browser_version": "120",
+            "os": "Windows 11",
+            "creation_time": 1700000000,
+            "start_time": 1700000001,
+            "end_time": 1700000060,
+            "tags": ["bench"],
+            "custom-data": {"padding": "x" * self.payload_size},
+        }
+
+
+def percentile(values, fraction):
+    """Get a nearest-rank percentile of sorted values."""
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, round(fraction * len(values)) - 1))
+    return values[index]
+
+
+def measure(name, func, iterations, concurrency=1, size=0):
+    """Call `func` `iterations` times, from `concurrency` threads.
+
+    `size` is the number of bytes or items each call handles, used to
+    report throughput. Returns a result dict.
+    """
+    latencies = []
+    errors = []
+
+    def call(_):
+        start = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            errors.append(repr(e))
+        else:
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(call, range(iterations)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "name": name,
+        "iterations": iterations,
+        "concurrency": concurrency,
+        "errors": len(errors),
+        "seconds": elapsed,
+        "ops_per_second": len(latencies) / elapsed if elapsed else None,
+        "size_per_second": size * len(latencies) / elapsed if size else None,
+        "latency": {
+            "mean": sum(latencies) / len(latencies) if latencies else None,
+            "p50": percentile(latencies, 0.5),
+            "p90": percentile(latencies, 0.9),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else None,
+        },
+    }
+
+
+def bench_request_path(client, server, iterations):
+    return measure("request_path", client.information.get_status, iterations)
+
+
+def bench_request_path_concurrent(client, server, iterations):
+    return measure(
+        "request_path_concurrent",
+        client.information.get_status,
+        iterations,
+        concurrency=8,
+    )
+
+
+def bench_rate_limited(client, server, iterations):
+    throttle_every = server.throttle_every
+    server.throttle_every = throttle_every or 4
+    try:
+        return measure("rate_limited", client.information.get_status, iterations)
+    finally:
+        server.throttle_every = throttle_every
+
+
+def bench_pagination(client, server, iterations):
+    return measure(
+        "pagination",
+        lambda: sum(1 for _ in client.jobs.iter_jobs(full=True, page_size=100)),
+        max(1, iterations // 50),
+        size=server.jobs,
+    )
+
+
+def bench_list_jobs(client, server, iterations):
+    return measure(
+        "list_jobs",
+        lambda: len(client.jobs.get_jobs(full=True, limit=server.jobs)),
+        max(1, iterations // 50),
+        size=server.jobs,
+    )
+
+
+def bench_stream_jobs(client, server, iterations):
+    return measure(
+        "stream_jobs",
+        lambda: sum(
+            1 for _ in client.jobs.get_jobs(full=True, limit=server.jobs, stream=True)
+        ),
+        max(1, iterations // 50),
+        size=server.jobs,
+    )
+
+
+def bench_bulk_update(client, server, iterations):
+    job_ids = [f"{i:032x}" for i in range(100)]
+
+    def update():
+        _, errors = client.jobs.update_jobs(job_ids, passed=True)
+        if errors:
+            raise next(iter(errors.values()))
+
+    return measure("bulk_update", update, max(1, iterations // 50), size=len(job_ids))
+
+
+def bench_upload(client, server, iterations):
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory, "app.zip")
+        with path.open("wb") as f:
+            f.truncate(server.asset_size)
+        return measure(
+            "upload",
+            lambda: client.storage.upload_file(path),
+            max(1, iterations // 20),
+            size=server.asset_size,
+        )
+
+
+def bench_download(client, server, iterations):
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory, "video.mp4")
+        return measure(
+            "download",
+            lambda: client.jobs.download_job_asset(
+                "job-id", "video.mp4", path, resume=False
+            ),
+            max(1, iterations // 20),
+            size=server.asset_size,
+        )
+
+
+BENCHMARKS = {
+    "request_path": bench_request_path,
+    "request_path_concurrent": bench_request_path_concurrent,
+    "rate_limited": bench_rate_limited,
+    "pagination": bench_pagination,
+    "list_jobs": bench_list_jobs,
+    "stream_jobs": bench_stream_jobs,
+    "bulk_update": bench_bulk_update,
+    "upload": bench_upload,
+    "download": bench_download,
+}
+
+
+def run_benchmarks(names=None, iterations=200, cafile=None, **server_options):
+    """Run benchmarks against a `MockSauceServer`.
+
+    `names` selects benchmarks from `BENCHMARKS`, all by default.
+    `server_options` are passed on to `MockSauceServer`, and `cafile` is
+    trusted by the client when the server speaks HTTPS. Returns a JSON
+    serializable dict.
+    """
+    metrics = sauceclient.RequestMetrics()
+    results = []
+    with MockSauceServer(**server_options) as server:
+        client = sauceclient.SauceClient(
+            USERNAME,
+            "bench-access-key",
+            apibase=server.apibase,
+            retry=sauceclient.RetryPolicy(backoff_factor=0),
+        )
+        if cafile is not None:
+            client.pool.ssl_context = ssl.create_default_context(cafile=cafile)
+        client.hooks.append(metrics)
+        with client:
+            for name in names or BENCHMARKS:
+                results.append(BENCHMARKS[name](client, server, iterations))
+        config = {
+            "iterations": iterations,
+            "scheme": server.scheme,
+            "latency": server.latency,
+            "payload_size": server.payload_size,
+            "jobs": server.jobs,
+            "asset_size": server.asset_size,
+            "throttle_every": server.throttle_every,
+            "error_rate": server.error_rate,
+            "compress": server.compress,
+        }
+    return {
+        "timestamp": time.time(),
+        "python": platform.python_implementation() + " " + platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "benchmarks": results,
+        "metrics": metrics.snapshot(),
+    }
+
+
+def compare(results, baseline, tolerance=0.25):
+    """Compare benchmark results against a baseline run.
+
+    Returns a list of regressions: benchmarks whose throughput dropped, or
+    whose median latency grew, by more than `tolerance`.
+    """
+    previous = {result["name"]: result for result in baseline["benchmarks"]}
+    regressions = []
+    for result in results["benchmarks"]:
+        base = previous.get(result["name"])
+        if base is None:
+            continue
+        if result["errors"] > base["errors"]:
+            regressions.append(
+                f"{result['name']}: {result['errors']} errors, was {base['errors']}"
+            )
+        rate, base_rate = result["ops_per_second"], base["ops_per_second"]
+        if rate and base_rate and rate < base_rate * (1 - tolerance):
+            regressions.append(
+                f"{result['name']}: {rate:.1f} ops/s, was {base_rate:.1f}"
+            )
+        p50, base_p50 = result["latency"]["p50"], base["latency"]["p50"]
+        if p50 and base_p50 and p50 > base_p50 * (1 + tolerance):
+            regressions.append(
+                f"{result['name']}: p50 {p50 * 1000:.2f}ms, was {base_p50 * 1000:.2f}ms"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", help=", ".join(BENCHMARKS))
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--payload-size", type=int, default=512)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--asset-size", type=int, default=1024 * 1024)
+    parser.add_argument("--throttle-every", type=int, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--no-compress", action="store_true")
+    parser.add_argument("--certfile")
+    parser.add_argument("--keyfile")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+    results = run_benchmarks(
+        args.names,
+        iterations=args.iterations,
+        cafile=args.certfile,
+        latency=args.latency,
+        payload_size=args.payload_size,
+        jobs=args.jobs,
+        asset_size=args.asset_size,
+        throttle_every=args.throttle_every,
+        error_rate=args.error_rate,
+        compress=not args.no_compress,
+        certfile=args.certfile,
+        keyfile=args.keyfile,
+    )
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,15 +13,43 @@ Sauce Labs REST API documentation:
 https://docs.saucelabs.com/dev/api
 """
 
+import array
+import asyncio
 import base64
+import bisect
+import codecs
+import fnmatch
+import gzip
 import hmac
 import http.client as http_client
+import importlib
+import inspect
 import json
 import os
-from hashlib import md5
+import queue
+import random
+import re
+import sqlite3
+import ssl
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from hashlib import md5, sha256
+from itertools import islice, pairwise
 from pathlib import Path
+from types import MappingProxyType
 from urllib.parse import urlencode
 
+CHUNK_SIZE = 1024 * 1024
+
 
 class SauceException(Exception):
     """SauceClient exception."""
@@ -32,15 +60,1055 @@ class SauceException(Exception):
         self.response = kwargs.get("response")
 
 
+def run_batch(func, calls, max_workers=8):
+    """Run `func(key, **kwargs)` for every `(key, kwargs)` pair in `calls`
+    on a pool of at most `max_workers` threads.
+
+    Returns a `(results, errors)` tuple of dicts keyed by `key`. A failing
+    call ends up in `errors` and does not stop the rest of the batch.
+    """
+    results = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(func, key, **kwargs): key for key, kwargs in calls}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                errors[key] = e
+    return results, errors
+
+
+async def gather_batch(func, calls, max_workers=8):
+    """Await `func(key, **kwargs)` for every `(key, kwargs)` pair in `calls`,
+    with at most `max_workers` calls in flight.
+
+    The asyncio counterpart of `run_batch`, with the same return value.
+    """
+    results = {}
+    errors = {}
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def call(key, kwargs):
+        async with semaphore:
+            try:
+                results[key] = await func(key, **kwargs)
+            except Exception as e:
+                errors[key] = e
+
+    await asyncio.gather(*(call(key, kwargs) for key, kwargs in calls))
+    return results, errors
+
+
+def iter_pages(fetch, page_size, prefetch=1):
+    """Iterate over the items of the pages returned by `fetch(skip)`, until
+    a page holds fewer than `page_size` items.
+
+    Up to `prefetch` following pages are fetched on background threads while
+    the current page is consumed.
+    """
+    executor = ThreadPoolExecutor(max_workers=max(prefetch, 1))
+    pending = deque()
+    skip = 0
+    try:
+        while True:
+            while len(pending) <= prefetch:
+                pending.append(executor.submit(fetch, skip))
+                skip += page_size
+            page = pending.popleft().result()
+            yield from page
+            if len(page) < page_size:
+                return
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def aiter_pages(fetch, page_size, prefetch=1):
+    """Asyncio counterpart of `iter_pages`, for a `fetch` returning
+    coroutines. Following pages are fetched as tasks.
+    """
+    pending = deque()
+    skip = 0
+    try:
+        while True:
+            while len(pending) <= prefetch:
+                pending.append(asyncio.ensure_future(fetch(skip)))
+                skip += page_size
+            page = await pending.popleft()
+            for item in page:
+                yield item
+            if len(page) < page_size:
+                return
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def iter_batches(sources, max_workers=4, prefetch=2):
+    """Chain the items of the batches yielded by each iterable in `sources`,
+    in order.
+
+    Up to `max_workers` of the iterables are consumed ahead on background
+    threads, each buffering at most `prefetch` batches until they are
+    reached.
+    """
+    stopped = threading.Event()
+
+    def put(buffer, batch):
+        while not stopped.is_set():
+            try:
+                buffer.put(batch, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def drain(batches, buffer):
+        try:
+            for batch in batches:
+                if not put(buffer, batch):
+                    return
+        except Exception as e:
+            put(buffer, e)
+            return
+        put(buffer, None)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = deque()
+    sources = iter(sources)
+    try:
+        while True:
+            while len(pending) < max_workers:
+                batches = next(sources, None)
+                if batches is None:
+                    break
+                buffer = queue.Queue(maxsize=max(prefetch, 1))
+                executor.submit(drain, batches, buffer)
+                pending.append(buffer)
+            if not pending:
+                return
+            buffer = pending.popleft()
+            while (batch := buffer.get()) is not None:
+                if isinstance(batch, Exception):
+                    raise batch
+                yield from batch
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def aiter_batches(sources, max_workers=4, prefetch=2):
+    """Asyncio counterpart of `iter_batches`, for async iterables. They are
+    consumed ahead as tasks.
+    """
+
+    async def drain(batches, buffer):
+        try:
+            async for batch in batches:
+                await buffer.put(batch)
+        except Exception as e:
+            await buffer.put(e)
+            return
+        await buffer.put(None)
+
+    pending = deque()
+    sources = iter(sources)
+    try:
+        while True:
+            while len(pending) < max_workers:
+                batches = next(sources, None)
+                if batches is None:
+                    break
+                buffer = asyncio.Queue(maxsize=max(prefetch, 1))
+                pending.append((asyncio.ensure_future(drain(batches, buffer)), buffer))
+            if not pending:
+                return
+            _, buffer = pending.popleft()
+            while (batch := await buffer.get()) is not None:
+                if isinstance(batch, Exception):
+                    raise batch
+                for item in batch:
+                    yield item
+    finally:
+        for task, _ in pending:
+            task.cancel()
+
+
+def is_transient_error(error):
+    """Check whether a failed request is worth retrying."""
+    if isinstance(error, SauceException):
+        status = getattr(error.response, "status", None)
+        return status is not None and (status == 429 or status >= 500)
+    # other OSErrors, like a missing local file, won't go away on retry
+    return isinstance(error, (ConnectionError, TimeoutError, http_client.HTTPException))
+
+
+def is_replayable(body):
+    """Check whether a request body can be sent again."""
+    return (
+        body is None
+        or isinstance(body, (bytes, str))
+        or body_position(body) is not None
+    )
+
+
+def body_position(body):
+    """Get the stream position of a seekable file-like request body.
+
+    Returns None for any other kind of body.
+    """
+    seekable = getattr(body, "seekable", None)
+    if seekable is not None and seekable():
+        return body.tell()
+    return None
+
+
+async def close_after(awaitable, f):
+    """Await `awaitable`, then close file `f`."""
+    try:
+        return await awaitable
+    finally:
+        f.close()
+
+
+def map_result(result, func):
+    """Apply `func` to a request result, which is awaited first if it comes
+    from an `AsyncSauceClient`.
+    """
+    if inspect.isawaitable(result):
+        return map_after(result, func)
+    return func(result)
+
+
+async def map_after(awaitable, func):
+    """Await `awaitable`, then apply `func` to its result."""
+    return func(await awaitable)
+
+
+def iter_body(body, chunk_size=CHUNK_SIZE):
+    """Iterate over a file-like or iterable request body in chunks."""
+    if hasattr(body, "read"):
+        return iter(lambda: body.read(chunk_size), b"")
+    return iter(body)
+
+
+class JSONReader:
+    """Incremental decoder for JSON read from an iterable of bytes chunks.
+
+    Values are decoded with `json.JSONDecoder.raw_decode` as soon as they
+    are complete, and the text before them is dropped, so only the value
+    being decoded is held in memory.
+    """
+
+    whitespace = re.compile(r"[ \t\n\r]*")
+    number_tail = re.compile(r"[0-9.eE+-]*")
+
+    def __init__(self, chunks):
+        """Initialize class."""
+        self.chunks = iter(chunks)
+        self.decoder = json.JSONDecoder()
+        self.utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def read(self):
+        """Add the next chunk to the buffer. Returns False at the end of
+        the input.
+        """
+        if self.eof:
+            return False
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.eof = True
+            text = self.utf8.decode(b"", final=True)
+        else:
+            text = self.utf8.decode(chunk)
+        self.buffer = self.buffer[self.pos :] + text
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Skip whitespace and get the next character, or "" at the end of
+        the input.
+        """
+        while True:
+            self.pos = self.whitespace.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read():
+                return ""
+
+    def expect(self, chars):
+        """Consume the next character, which must be one of `chars`."""
+        char = self.peek()
+        if not char or char not in chars:
+            expected = " or ".join(repr(c) for c in chars)
+            raise json.JSONDecodeError(f"Expecting {expected}", self.buffer, self.pos)
+        self.pos += 1
+        return char
+
+    def decode(self):
+        """Decode the next JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.read():
+                    raise
+                continue
+            # a number at the end of the buffer may go on in the next chunk
+            if self.eof or not (
+                isinstance(value, (int, float))
+                and self.number_tail.fullmatch(self.buffer, end)
+            ):
+                self.pos = end
+                return value
+            self.read()
+
+    def iter_array(self):
+        """Decode a JSON array, yielding its elements one at a time."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.decode()
+            if self.expect(",]") == "]":
+                return
+
+
+def iter_json_array(chunks, key=None):
+    """Decode a JSON array from an iterable of bytes chunks, yielding its
+    elements as soon as they are complete.
+
+    With `key`, the input must be a JSON object instead, and the array under
+    `key` is decoded, e.g. "items" for analytics results. The object's other
+    members are the return value of the generator.
+    """
+    reader = JSONReader(chunks)
+    rest = None
+    if key is None:
+        yield from reader.iter_array()
+    else:
+        rest = {}
+        reader.expect("{")
+        if reader.peek() == "}":
+            reader.pos += 1
+        else:
+            while True:
+                name = reader.decode()
+                reader.expect(":")
+                if name == key and reader.peek() == "[":
+                    yield from reader.iter_array()
+                else:
+                    rest[name] = reader.decode()
+                if reader.expect(",}") == "}":
+                    break
+    if reader.peek():
+        raise json.JSONDecodeError("Extra data", reader.buffer, reader.pos)
+    return rest
+
+
+def iter_decompressed(chunks, encoding):
+    """Decompress an iterable of gzip or deflate encoded chunks incrementally.
+
+    Chunks with any other Content-Encoding are passed through unchanged.
+    """
+    if isinstance(encoding, str):
+        encoding = encoding.strip().lower()
+    if encoding not in ("gzip", "x-gzip", "deflate"):
+        yield from chunks
+        return
+    decompressor = None
+    head = b""
+    for chunk in chunks:
+        if decompressor is None:
+            # the header check below needs the first two bytes
+            head += chunk
+            if len(head) < 2:
+                continue
+            chunk, head = head, b""
+            # some servers send deflate data without the zlib header
+            raw = encoding == "deflate" and (
+                chunk[0] & 0x0F != 8 or int.from_bytes(chunk[:2], "big") % 31
+            )
+            # 47 detects a gzip or zlib header automatically
+            decompressor = zlib.decompressobj(-zlib.MAX_WBITS if raw else 47)
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+    if decompressor is not None:
+        data = decompressor.flush()
+        if data:
+            yield data
+
+
+def iter_response(response, chunk_size=CHUNK_SIZE, event=None):
+    """Read a response body in chunks of up to `chunk_size` bytes.
+
+    Read time and bytes received are added to the `RequestEvent` if given.
+    """
+    while True:
+        mark = time.perf_counter()
+        chunk = response.read(chunk_size)
+        if not chunk:
+            return
+        if event is not None:
+            event.add_phase("read", mark)
+            event.bytes_received += len(chunk)
+        yield chunk
+
+
+def decompress_body(response, data):
+    """Decompress a whole response body according to its Content-Encoding."""
+    chunks = list(iter_decompressed([data], response.getheader("Content-Encoding")))
+    return chunks[0] if len(chunks) == 1 else b"".join(chunks)
+
+
+def file_md5(source, chunk_size=CHUNK_SIZE):
+    """Compute the md5 hex digest of a file path or binary file object,
+    reading it in `chunk_size` blocks.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with Path(source).open("rb") as f:
+            return file_md5(f, chunk_size)
+    digest = md5()
+    for chunk in iter(lambda: source.read(chunk_size), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DigestIndex:
+    """Index of file md5 digests keyed by absolute path.
+
+    An entry is reused as long as the file's mtime and size are unchanged.
+    If `path` is given, the index is loaded from and saved to that JSON file,
+    so unchanged files are not hashed again on later runs.
+    """
+
+    def __init__(self, path=None):
+        """Initialize class."""
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        if path is not None:
+            try:
+                self.entries = json.loads(Path(path).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                pass
+
+    def digest(self, filepath):
+        """Get the md5 hex digest of a file, hashing it only if it changed."""
+        filepath = os.path.abspath(filepath)
+        stat = os.stat(filepath)
+        key = [stat.st_mtime_ns, stat.st_size]
+        with self._lock:
+            entry = self.entries.get(filepath)
+        if entry is not None and entry[:2] == key:
+            return entry[2]
+        digest = file_md5(filepath)
+        with self._lock:
+            self.entries[filepath] = [*key, digest]
+            self.save()
+        return digest
+
+    def save(self):
+        """Write the index to disk, if it has a path."""
+        if self.path is None:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=directory, delete=False
+        ) as f:
+            json.dump(self.entries, f)
+        os.replace(f.name, self.path)
+
+
+UploadResult = namedtuple(
+    "UploadResult", ["path", "response", "bytes_sent", "elapsed", "md5", "error"]
+)
+UploadResult.__doc__ = """Outcome of uploading one file with `Storage.upload_files`."""
+
+
+class UploadBody:
+    """File-like upload body that streams `source` in fixed-size chunks.
+
+    `source` is a binary file-like object or an iterable of bytes. After each
+    chunk is read, `callback(bytes_sent, total, bytes_per_second)` is called
+    if given.
+    """
+
+    def __init__(self, source, length, chunk_size=CHUNK_SIZE, callback=None):
+        """Initialize class."""
+        self.source = source
+        self.length = length
+        self.chunk_size = chunk_size
+        self.callback = callback
+        self.sent = 0
+        self.started = None
+        self.start_position = body_position(source)
+        self._chunks = None if hasattr(source, "read") else iter(source)
+
+    def read(self, size=-1):
+        """Read the next chunk, ignoring `size`."""
+        if self.started is None:
+            self.started = time.monotonic()
+        if self._chunks is None:
+            chunk = self.source.read(self.chunk_size)
+        else:
+            chunk = next(self._chunks, b"")
+        if chunk:
+            self.sent += len(chunk)
+            if self.callback is not None:
+                elapsed = time.monotonic() - self.started
+                rate = self.sent / elapsed if elapsed else 0.0
+                self.callback(self.sent, self.length, rate)
+        return chunk
+
+    def seekable(self):
+        return self.start_position is not None
+
+    def tell(self):
+        return self.source.tell()
+
+    def seek(self, offset):
+        self.source.seek(offset)
+        self.sent = offset - self.start_position
+
+
+class RetryPolicy:
+    """Retry rules for failed requests.
+
+    A request that fails with a connection error or one of `statuses` is
+    retried up to `total` times. Before each retry it waits for the server's
+    Retry-After delay, or else for an exponential backoff with full jitter.
+    Either wait is capped at `max_backoff` seconds. Only `methods` are
+    retried; POST is left out by default since it is not idempotent.
+    """
+
+    def __init__(
+        self,
+        total=3,
+        backoff_factor=0.5,
+        max_backoff=60,
+        statuses=(429, 500, 502, 503, 504),
+        methods=("DELETE", "GET", "HEAD", "OPTIONS", "PUT"),
+    ):
+        """Initialize class."""
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(methods)
+
+    def is_retryable(self, method, attempt, status=None):
+        """Check whether attempt number `attempt` (counting from 0) of a
+        request may be retried. `status` is None for connection errors.
+        """
+        return (
+            attempt < self.total
+            and method in self.methods
+            and (status is None or status in self.statuses)
+        )
+
+    def get_backoff(self, attempt, response=None):
+        """Get the number of seconds to wait before the next attempt."""
+        retry_after = response is not None and response.getheader("Retry-After")
+        if isinstance(retry_after, str):
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    date = parsedate_to_datetime(retry_after)
+                except (TypeError, ValueError):
+                    date = None
+                delay = None if date is None else date.timestamp() - time.time()
+            if delay is not None:
+                return min(max(delay, 0.0), self.max_backoff)
+        backoff = min(self.max_backoff, self.backoff_factor * 2**attempt)
+        return random.uniform(0, backoff)
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter.
+
+    Allows `rate` requests per second on average, in bursts of up to
+    `capacity` requests. Callers that exceed the rate queue up in order
+    instead of retrying all at once.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """Initialize class."""
+        self.rate = rate
+        self.capacity = capacity or max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token, returning the number of seconds to wait before
+        using it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self.updated
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self):
+        """Take a token, blocking until it may be used."""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+
+CacheEntry = namedtuple("CacheEntry", ["expires", "etag", "last_modified", "value"])
+CacheEntry.__doc__ = """Decoded response stored in a `ResponseCache`."""
+
+
+class ResponseCache:
+    """TTL cache for decoded GET responses, with LRU eviction.
+
+    `ttls` maps endpoint path prefixes to a time-to-live in seconds; only
+    GET requests under one of those prefixes are cached, using the longest
+    matching prefix. At most `maxsize` entries are kept in memory, and if
+    `directory` is given, entries are also stored there as JSON files.
+
+    Expired entries with an ETag or Last-Modified validator are revalidated
+    with a conditional request. Cached values are shared between callers
+    and must not be modified.
+    """
+
+    default_ttls = {
+        "/rest/v1/info/platforms": 3600,
+        "/rest/v1/info/status": 60,
+    }
+
+    def __init__(self, ttls=None, maxsize=128, directory=None):
+        """Initialize class."""
+        self.ttls = self.default_ttls if ttls is None else ttls
+        self.maxsize = maxsize
+        self.directory = directory
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get_ttl(self, url):
+        """Get the time-to-live for an endpoint, or None if it isn't cached."""
+        path = url.split("?", 1)[0]
+        prefixes = [prefix for prefix in self.ttls if path.startswith(prefix)]
+        if not prefixes:
+            return None
+        return self.ttls[max(prefixes, key=len)]
+
+    def get_path(self, url):
+        """Get the file an entry is stored in on disk."""
+        name = sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{name}.json")
+
+    def get(self, url):
+        """Get the entry for a url, expired or not, or None."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+                return entry
+        if self.directory is None:
+            return None
+        try:
+            entry = CacheEntry(
+                *json.loads(Path(self.get_path(url)).read_text(encoding="utf-8"))
+            )
+        except (OSError, TypeError, ValueError):
+            return None
+        self._store(url, entry)
+        return entry
+
+    def set(self, url, value, ttl, response=None):
+        """Store a decoded response for `ttl` seconds.
+
+        Validators are taken from the response headers, if given.
+        """
+        etag = last_modified = None
+        if response is not None:
+            etag = response.getheader("ETag")
+            last_modified = response.getheader("Last-Modified")
+        entry = CacheEntry(
+            time.time() + ttl,
+            etag if isinstance(etag, str) else None,
+            last_modified if isinstance(last_modified, str) else None,
+            value,
+        )
+        self._store(url, entry)
+        if self.directory is not None:
+            path = self.get_path(url)
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.directory, delete=False
+            ) as f:
+                json.dump(list(entry), f)
+            os.replace(f.name, path)
+        return entry
+
+    def _store(self, url, entry):
+        with self._lock:
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries from memory and disk."""
+        with self._lock:
+            self._entries.clear()
+        if self.directory is not None:
+            for path in Path(self.directory).glob("*.json"):
+                path.unlink(missing_ok=True)
+
+
+def endpoint_template(url, username=None):
+    """Turn a request url into a low-cardinality endpoint label for metrics,
+    e.g. "/rest/v1/{username}/jobs/{id}".
+    """
+    parts = url.split("?", 1)[0].split("/")
+    for i, part in enumerate(parts):
+        if username and part == username:
+            parts[i] = "{username}"
+        elif re.fullmatch(r"\d+|[0-9a-fA-F-]{16,}", part):
+            parts[i] = "{id}"
+    return "/".join(parts)
+
+
+class RequestEvent:
+    """Timings and counters for one call to `SauceClient.request`, passed to
+    every hook in `SauceClient.hooks` once the call is done.
+
+    `phases` maps phase names to seconds, summed over retries: "connect"
+    (DNS lookup, TCP connect and TLS handshake of new connections, which
+    http.client does in one step), "send", "wait" (time to first byte of
+    the response), "read" and "decode".
+    """
+
+    def __init__(self, method, url, endpoint, bytes_sent=0):
+        """Initialize class."""
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint
+        self.bytes_sent = bytes_sent
+        self.bytes_received = 0
+        self.status = None
+        self.attempts = 0
+        self.error = None
+        self.phases = {}
+        self.started = time.perf_counter()
+        self.duration = None
+
+    def add_phase(self, phase, started):
+        """Add the time since `started`, a `time.perf_counter` value, to a
+        phase. Returns the current `time.perf_counter` value.
+        """
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - started
+        return now
+
+
+class RequestMetrics:
+    """In-memory aggregator of `RequestEvent`s, per method and endpoint.
+
+    Add an instance to `SauceClient.hooks`, then export latency histograms,
+    phase timings, byte counters and error counts with `snapshot` (a JSON
+    serializable dict) or `to_prometheus` (Prometheus text format).
+    """
+
+    buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        """Initialize class."""
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        with self._lock:
+            stats = self.endpoints.get((event.method, event.endpoint))
+            if stats is None:
+                stats = self.endpoints[(event.method, event.endpoint)] = {
+                    "count": 0,
+                    "errors": 0,
+                    "retries": 0,
+                    "bytes_sent": 0,
+                    "bytes_received": 0,
+                    "duration_sum": 0.0,
+                    "duration_buckets": [0] * len(self.buckets),
+                    "phases": {},
+                }
+            stats["count"] += 1
+            stats["errors"] += event.error is not None
+            stats["retries"] += max(0, event.attempts - 1)
+            stats["bytes_sent"] += event.bytes_sent
+            stats["bytes_received"] += event.bytes_received
+            stats["duration_sum"] += event.duration
+            index = bisect.bisect_left(self.buckets, event.duration)
+            if index < len(self.buckets):
+                stats["duration_buckets"][index] += 1
+            for phase, seconds in event.phases.items():
+                stats["phases"][phase] = stats["phases"].get(phase, 0.0) + seconds
+
+    def snapshot(self):
+        """Get the aggregated metrics as a JSON serializable dict.
+
+        Histogram bucket counts are cumulative, as in Prometheus.
+        """
+        with self._lock:
+            endpoints = []
+            for (method, endpoint), stats in sorted(self.endpoints.items()):
+                cumulative = []
+                total = 0
+                for count in stats["duration_buckets"]:
+                    total += count
+                    cumulative.append(total)
+                endpoints.append(
+                    {
+                        "method": method,
+                        "endpoint": endpoint,
+                        **stats,
+                        "duration_buckets": dict(
+                            zip(map(str, self.buckets), cumulative, strict=True)
+                        ),
+                        "phases": dict(stats["phases"]),
+                    }
+                )
+        return {"endpoints": endpoints}
+
+    def to_prometheus(self):
+        """Get the aggregated metrics in Prometheus text format."""
+        snapshot = self.snapshot()["endpoints"]
+        lines = []
+
+        def metric(name, kind, description, samples):
+            lines.append(f"# HELP sauceclient_{name} {description}")
+            lines.append(f"# TYPE sauceclient_{name} {kind}")
+            for suffix, labels, value in samples:
+                text = ",".join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f"sauceclient_{name}{suffix}{{{text}}} {value}")
+
+        def labels(stats, **extra):
+            return {"method": stats["method"], "endpoint": stats["endpoint"], **extra}
+
+        histogram = []
+        for stats in snapshot:
+            for le, count in stats["duration_buckets"].items():
+                histogram.append(("_bucket", labels(stats, le=le), count))
+            histogram.append(("_bucket", labels(stats, le="+Inf"), stats["count"]))
+            histogram.append(("_sum", labels(stats), stats["duration_sum"]))
+            histogram.append(("_count", labels(stats), stats["count"]))
+        metric(
+            "request_duration_seconds",
+            "histogram",
+            "Duration of API requests.",
+            histogram,
+        )
+        for name, key, description in (
+            ("request_errors_total", "errors", "Failed API requests."),
+            ("request_retries_total", "retries", "Retried API request attempts."),
+            ("request_sent_bytes_total", "bytes_sent", "Request body bytes sent."),
+            ("request_received_bytes_total", "bytes_received", "Body bytes read."),
+        ):
+            samples = [("", labels(stats), stats[key]) for stats in snapshot]
+            metric(name, "counter", description, samples)
+        samples = [
+            ("", labels(stats, phase=phase), seconds)
+            for stats in snapshot
+            for phase, seconds in sorted(stats["phases"].items())
+        ]
+        metric(
+            "request_phase_seconds_total",
+            "counter",
+            "Time spent in each phase of API requests.",
+            samples,
+        )
+        return "\n".join(lines) + "\n"
+
+
+class ConnectionPool:
+    """Thread-safe pool of reusable keep-alive HTTPS connections to one host.
+
+    Idle connections are handed out most-recently-used first. Connections
+    idle for longer than `idle_timeout` seconds are discarded, and at most
+    `maxsize` idle connections are kept around. A host prefixed with
+    "http://" is connected to over plain HTTP, e.g. for a local test server.
+    """
+
+    stale_errors = (
+        http_client.BadStatusLine,
+        BrokenPipeError,
+        ConnectionResetError,
+        ConnectionAbortedError,
+    )
+
+    def __init__(self, host, maxsize=10, idle_timeout=60, timeout=None):
+        """Initialize class."""
+        scheme, _, host = host.rpartition("://")
+        self.host = host
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.ssl_context = None if scheme == "http" else ssl.create_default_context()
+        self._idle = deque()
+        self._lock = threading.Lock()
+
+    def new_connection(self):
+        """Open a new connection to the host."""
+        kwargs = {} if self.timeout is None else {"timeout": self.timeout}
+        if self.ssl_context is None:
+            return http_client.HTTPConnection(self.host, **kwargs)
+        return http_client.HTTPSConnection(
+            self.host, context=self.ssl_context, **kwargs
+        )
+
+    def get(self):
+        """Get a connection from the pool, opening a new one if none are idle.
+
+        Returns a `(connection, reused)` tuple.
+        """
+        expired = []
+        connection = None
+        with self._lock:
+            now = time.monotonic()
+            while self._idle:
+                conn, released = self._idle.pop()
+                if now - released <= self.idle_timeout:
+                    connection = conn
+                    break
+                # older entries have been idle even longer
+                expired.append(conn)
+                expired.extend(conn for conn, _ in self._idle)
+                self._idle.clear()
+        for conn in expired:
+            conn.close()
+        if connection is not None:
+            return connection, True
+        return self.new_connection(), False
+
+    def put(self, connection):
+        """Return a connection to the pool."""
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append((connection, time.monotonic()))
+                return
+        connection.close()
+
+    def send(self, method, url, body=None, headers=None, event=None):
+        """Send a request over a pooled connection, without reading the body.
+
+        If a reused connection turns out to be stale (closed by the server
+        while idle), the request is sent once more on a fresh connection.
+        Returns a `(connection, response)` tuple, to be handed back with
+        `release` once the response has been read. Phase timings are added
+        to the `RequestEvent` if given.
+        """
+        position = body_position(body)
+        if body is None or isinstance(body, (bytes, str)) or position is not None:
+            connection, reused = self.get()
+        else:
+            # a streamed body can't be sent twice, so don't risk a stale socket
+            connection, reused = self.new_connection(), False
+        while True:
+            try:
+                if event is not None:
+                    mark = time.perf_counter()
+                    if not reused:
+                        connection.connect()
+                        mark = event.add_phase("connect", mark)
+                connection.request(method, url, body, headers=headers or {})
+                if event is not None:
+                    mark = event.add_phase("send", mark)
+                response = connection.getresponse()
+                if event is not None:
+                    event.add_phase("wait", mark)
+            except self.stale_errors:
+                connection.close()
+                if not reused:
+                    raise
+                if position is not None:
+                    body.seek(position)
+                connection, reused = self.new_connection(), False
+                continue
+            except Exception:
+                connection.close()
+                raise
+            return connection, response
+
+    def release(self, connection, response, complete=True):
+        """Return a connection to the pool after reading its response.
+
+        The connection is closed instead if the server asked for that, or if
+        the response body was not read to the end.
+        """
+        if response.will_close or not complete:
+            connection.close()
+        else:
+            self.put(connection)
+
+    def urlopen(self, method, url, body=None, headers=None, event=None):
+        """Send a request over a pooled connection and read the response.
+
+        Returns a `(response, data)` tuple, with the body decompressed.
+        """
+        connection, response = self.send(method, url, body, headers, event)
+        try:
+            mark = time.perf_counter()
+            data = response.read()
+        except Exception:
+            connection.close()
+            raise
+        if event is not None:
+            event.add_phase("read", mark)
+            event.bytes_received += len(data)
+        self.release(connection, response)
+        return response, decompress_body(response, data)
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for connection, _ in idle:
+            connection.close()
+
+
 class SauceClient:
     """SauceClient class."""
 
-    def __init__(self, sauce_username=None, sauce_access_key=None, apibase=None):
+    def __init__(
+        self,
+        sauce_username=None,
+        sauce_access_key=None,
+        apibase=None,
+        pool_size=10,
+        pool_idle_timeout=60,
+        timeout=None,
+        retry=None,
+        rate_limiter=None,
+        cache=None,
+        compress_min_size=None,
+    ):
         """Initialize class."""
+        self._header_templates = {}
         self.sauce_username = sauce_username
         self.sauce_access_key = sauce_access_key
         self.apibase = apibase or "saucelabs.com"
+        self.compress_min_size = compress_min_size
         self.headers = self.make_headers()
+        self.retry = retry or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.hooks = []
+        self.pool = self.make_pool(pool_size, pool_idle_timeout, timeout)
         self.account = Account(self)
         self.information = Information(self)
         self.javascript = JavaScriptTests(self)
@@ -49,39 +1117,886 @@ class SauceClient:
         self.tunnels = Tunnels(self)
         self.analytics = Analytics(self)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def make_pool(self, pool_size, pool_idle_timeout, timeout):
+        """Create the connection pool used to send requests."""
+        return ConnectionPool(
+            self.apibase,
+            maxsize=pool_size,
+            idle_timeout=pool_idle_timeout,
+            timeout=timeout,
+        )
+
+    def close(self):
+        """Close all pooled connections."""
+        self.pool.close()
+
+    def run_batch(self, func, calls, max_workers=8):
+        """Run a batch of API calls concurrently with `run_batch`."""
+        return run_batch(func, calls, max_workers)
+
+    @property
+    def sauce_username(self):
+        """Username of the Sauce Labs account."""
+        return self._sauce_username
+
+    @sauce_username.setter
+    def sauce_username(self, value):
+        self._sauce_username = value
+        self._header_templates.clear()
+
+    @property
+    def sauce_access_key(self):
+        """Access key of the Sauce Labs account."""
+        return self._sauce_access_key
+
+    @sauce_access_key.setter
+    def sauce_access_key(self, value):
+        self._sauce_access_key = value
+        self._header_templates.clear()
+
     def get_auth_string(self):
         """Create auth string from credentials."""
         auth_info = f"{self.sauce_username}:{self.sauce_access_key}"
         return base64.b64encode(auth_info.encode("utf-8")).decode("utf-8")
 
     def make_headers(self, content_type="application/json"):
-        """Create content-type header."""
+        """Create content-type and accept-encoding headers."""
         return {
             "Content-Type": content_type,
+            "Accept-Encoding": "gzip, deflate",
         }
 
+    def get_header_template(self, content_type):
+        """Get the read-only headers, including authorization, sent with
+        every request of a content type.
+
+        Templates are built once and dropped when the credentials change.
+        """
+        template = self._header_templates.get(content_type)
+        if template is None:
+            headers = self.make_headers(content_type)
+            headers["Authorization"] = f"Basic {self.get_auth_string()}"
+            template = MappingProxyType(headers)
+            self._header_templates[content_type] = template
+        return template
+
     def make_auth_headers(self, content_type):
         """Add authorization header."""
-        headers = self.make_headers(content_type)
-        headers["Authorization"] = f"Basic {self.get_auth_string()}"
+        return dict(self.get_header_template(content_type))
+
+    def request(
+        self, method, url, body=None, content_type="application/json", headers=None
+    ):
+        """Send http request.
+
+        GET responses from endpoints configured in the client's `cache` are
+        served from it while fresh. Requests that reach the server are
+        reported to the client's `hooks` as a `RequestEvent`.
+        """
+        headers = {**self.get_header_template(content_type), **(headers or {})}
+        body = self.compress_body(body, headers)
+        ttl = entry = None
+        if self.cache is not None and method == "GET":
+            ttl = self.cache.get_ttl(url)
+        if ttl is not None:
+            entry = self.cache.get(url)
+            if entry is not None:
+                if entry.expires > time.time():
+                    return entry.value
+                headers.update(self.make_conditional_headers(entry))
+        if not self.hooks:
+            response, data = self.send(method, url, body, headers)
+            return self.handle_cached_response(url, response, data, ttl, entry)
+        event = self.make_event(method, url, body, headers)
+        try:
+            response, data = self.send(method, url, body, headers, event)
+            mark = time.perf_counter()
+            value = self.handle_cached_response(url, response, data, ttl, entry)
+            event.add_phase("decode", mark)
+            return value
+        except Exception as e:
+            event.error = e
+            raise
+        finally:
+            self.emit(event)
+
+    def compress_body(self, body, headers):
+        """Gzip a request body of at least `compress_min_size` bytes, adding
+        a Content-Encoding header.
+
+        Compression is off unless `compress_min_size` is set, as not every
+        endpoint accepts compressed bodies. Streamed bodies are sent as is.
+        """
+        if self.compress_min_size is None or "Content-Encoding" in headers:
+            return body
+        data = body.encode("utf-8") if isinstance(body, str) else body
+        if not isinstance(data, bytes) or len(data) < self.compress_min_size:
+            return body
+        headers["Content-Encoding"] = "gzip"
+        return gzip.compress(data, mtime=0)
+
+    def make_event(self, method, url, body, headers):
+        """Create a `RequestEvent` for a request."""
+        if isinstance(body, (bytes, str)):
+            bytes_sent = len(body)
+        else:
+            bytes_sent = int(headers.get("Content-Length", 0))
+        endpoint = endpoint_template(url, self.sauce_username)
+        return RequestEvent(method, url, endpoint, bytes_sent)
+
+    def emit(self, event):
+        """Pass a finished `RequestEvent` to the client's hooks."""
+        event.duration = time.perf_counter() - event.started
+        for hook in self.hooks:
+            hook(event)
+
+    @contextmanager
+    def track(self, event):
+        """Record an error raised in the block on a `RequestEvent`, and emit
+        the event once the block is done. Does nothing if `event` is None.
+        """
+        if event is None:
+            yield
+            return
+        try:
+            yield
+        except Exception as e:
+            event.error = e
+            raise
+        finally:
+            self.emit(event)
+
+    def send(self, method, url, body=None, headers=None, event=None):
+        """Send http request, retrying failures.
+
+        Failed requests are retried according to the client's `retry`
+        policy, and every attempt waits for the `rate_limiter`, if any.
+        Returns a `(response, data)` tuple.
+        """
+        position = body_position(body)
+        replayable = is_replayable(body)
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            if event is not None:
+                event.attempts += 1
+            try:
+                response, data = self.pool.urlopen(
+                    method, url, body, headers=headers, event=event
+                )
+            except (OSError, http_client.HTTPException):
+                if not (replayable and self.retry.is_retryable(method, attempt)):
+                    raise
+                delay = self.retry.get_backoff(attempt)
+            else:
+                if event is not None:
+                    event.status = response.status
+                if not (
+                    replayable
+                    and self.retry.is_retryable(method, attempt, response.status)
+                ):
+                    return response, data
+                delay = self.retry.get_backoff(attempt, response)
+            time.sleep(delay)
+            if position is not None:
+                body.seek(position)
+            attempt += 1
+
+    def send_stream(self, method, url, headers=None, event=None):
+        """Send http request, retrying failures like `send`, but without
+        reading the body of the final response.
+
+        Returns a `(connection, response)` tuple, to be handed back with
+        `pool.release` once the response has been read.
+        """
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            if event is not None:
+                event.attempts += 1
+            try:
+                connection, response = self.pool.send(
+                    method, url, headers=headers, event=event
+                )
+            except (OSError, http_client.HTTPException):
+                if not self.retry.is_retryable(method, attempt):
+                    raise
+                delay = self.retry.get_backoff(attempt)
+            else:
+                if event is not None:
+                    event.status = response.status
+                if not self.retry.is_retryable(method, attempt, response.status):
+                    return connection, response
+                # don't bother reading the error body of a retried response
+                self.pool.release(connection, response, complete=False)
+                delay = self.retry.get_backoff(attempt, response)
+            time.sleep(delay)
+            attempt += 1
+
+    def make_conditional_headers(self, entry):
+        """Create headers to revalidate an expired cache entry."""
+        headers = {}
+        if entry.etag is not None:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified is not None:
+            headers["If-Modified-Since"] = entry.last_modified
         return headers
 
-    def request(self, method, url, body=None, content_type="application/json"):
-        """Send http request."""
-        headers = self.make_auth_headers(content_type)
-        connection = http_client.HTTPSConnection(self.apibase)
-        connection.request(method, url, body, headers=headers)
-        response = connection.getresponse()
-        data = response.read()
-        connection.close()
-        if response.status not in (200, 201):
+    def handle_cached_response(self, url, response, data, ttl, entry):
+        """Decode a response, storing it in the cache if `ttl` is set.
+
+        A 304 Not Modified response refreshes the expired cache `entry`.
+        """
+        if ttl is None:
+            return self.handle_response(response, data)
+        if entry is not None and response.status == 304:
+            return self.cache.set(url, entry.value, ttl, response).value
+        value = self.handle_response(response, data)
+        self.cache.set(url, value, ttl, response)
+        return value
+
+    def make_download_headers(self, filepath, resume=True):
+        """Create the headers of a download request, with a Range to
+        continue an existing partial file if `resume` is set.
+
+        Returns a `(headers, offset)` tuple.
+        """
+        headers = self.make_auth_headers("application/json")
+        # ranges of an encoded body can't be resumed reliably
+        headers["Accept-Encoding"] = "identity"
+        offset = 0
+        if resume and os.path.exists(filepath):
+            offset = os.path.getsize(filepath)
+            headers["Range"] = f"bytes={offset}-"
+        return headers, offset
+
+    def download(self, url, filepath, resume=True, chunk_size=CHUNK_SIZE):
+        """Stream the body of a GET request to a file in chunks.
+
+        With `resume`, an existing partial file is continued with a Range
+        request. Failed requests are retried as in `send`. Returns the number
+        of bytes written. Downloads are reported to the client's `hooks`.
+        """
+        headers, offset = self.make_download_headers(filepath, resume)
+        event = self.make_event("GET", url, None, headers) if self.hooks else None
+        with self.track(event):
+            connection, response = self.send_stream("GET", url, headers, event)
+            complete = False
+            try:
+                if offset and response.status == 416:
+                    # nothing left to fetch
+                    response.read()
+                    complete = True
+                    return 0
+                if response.status not in (200, 206):
+                    response.read()
+                    complete = True
+                self.check_response(response, (200, 206))
+                written = 0
+                mode = "ab" if response.status == 206 else "wb"
+                with Path(filepath).open(mode) as f:
+                    for chunk in iter_response(response, chunk_size, event):
+                        f.write(chunk)
+                        written += len(chunk)
+                complete = True
+                return written
+            finally:
+                self.pool.release(connection, response, complete)
+
+    def stream(self, url, key=None, chunk_size=64 * 1024, factory=None):
+        """Send a GET request and decode the JSON array in the response body
+        incrementally, yielding its elements as they arrive.
+
+        `key` selects an array inside a JSON object, as in
+        `iter_json_array`. If given, `factory` is applied to each element.
+        The request is retried as in `send` until a response is accepted;
+        failures after that are raised. Streamed responses are not cached,
+        and are reported to the client's `hooks` once the stream is done.
+        """
+        headers = self.make_auth_headers("application/json")
+        event = self.make_event("GET", url, None, headers) if self.hooks else None
+        with self.track(event):
+            connection, response = self.send_stream("GET", url, headers, event)
+            complete = False
+            try:
+                if response.status not in (200, 201):
+                    response.read()
+                    complete = True
+                self.check_response(response)
+                chunks = iter_decompressed(
+                    iter_response(response, chunk_size, event),
+                    response.getheader("Content-Encoding"),
+                )
+                items = iter_json_array(chunks, key)
+                if factory is None:
+                    rest = yield from items
+                else:
+                    while True:
+                        try:
+                            item = next(items)
+                        except StopIteration as e:
+                            rest = e.value
+                            break
+                        yield factory(item)
+                complete = True
+                return rest
+            finally:
+                self.pool.release(connection, response, complete)
+
+    def check_response(self, response, statuses=(200, 201)):
+        """Raise SauceException if the response status is not OK."""
+        if response.status not in statuses:
             raise SauceException(
                 f"{response.status}: {response.reason}.\nSauce Status NOT OK",
                 response=response,
             )
+
+    def handle_response(self, response, data):
+        """Check response status and decode json body."""
+        self.check_response(response)
         return json.loads(data.decode("utf-8"))
 
 
+class AsyncResponse:
+    """HTTP response read from an asyncio stream.
+
+    Provides the parts of the `http.client.HTTPResponse` interface used by
+    sauceclient.
+    """
+
+    def __init__(self, version, status, reason, headers):
+        """Initialize class."""
+        self.version = version
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            self.will_close = connection != "keep-alive"
+        else:
+            self.will_close = connection == "close"
+
+    def getheader(self, name, default=None):
+        """Get a response header value."""
+        return self.headers.get(name.lower(), default)
+
+
+async def read_http_headers(reader):
+    """Read HTTP header lines from an asyncio stream into a dict."""
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in {b"\r\n", b"\n", b""}:
+            return headers
+        name, _, value = line.decode("iso-8859-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def read_http_response(reader, method="GET", event=None):
+    """Read an HTTP/1.1 response from an asyncio stream.
+
+    Returns a `(response, data)` tuple, with the body decompressed. Phase
+    timings are added to the `RequestEvent` if given.
+    """
+    mark = time.perf_counter()
+    line = await reader.readline()
+    if event is not None:
+        mark = event.add_phase("wait", mark)
+    if not line:
+        raise http_client.RemoteDisconnected(
+            "Remote end closed connection without response"
+        )
+    parts = line.decode("iso-8859-1").rstrip("\r\n").split(" ", 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/") or not parts[1].isdigit():
+        raise http_client.BadStatusLine(line)
+    version, status = parts[0], int(parts[1])
+    reason = parts[2] if len(parts) > 2 else ""
+    response = AsyncResponse(version, status, reason, await read_http_headers(reader))
+    if method == "HEAD" or status in {204, 304}:
+        data = b""
+    elif "chunked" in response.getheader("transfer-encoding", "").lower():
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0], 16)
+            if not size:
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        # discard trailers
+        await read_http_headers(reader)
+        data = b"".join(chunks)
+    elif response.getheader("content-length") is not None:
+        data = await reader.readexactly(int(response.getheader("content-length")))
+    else:
+        data = await reader.read()
+        response.will_close = True
+    if event is not None:
+        event.add_phase("read", mark)
+        event.bytes_received += len(data)
+    return response, decompress_body(response, data)
+
+
+class AsyncConnectionPool:
+    """Pool of reusable keep-alive HTTPS connections for asyncio.
+
+    Connections are `(reader, writer)` stream pairs speaking HTTP/1.1. At
+    most `limit` requests are in flight at once, and at most `maxsize` idle
+    connections are kept around for `idle_timeout` seconds. A host prefixed
+    with "http://" is connected to over plain HTTP.
+    """
+
+    stale_errors = (*ConnectionPool.stale_errors, asyncio.IncompleteReadError)
+
+    def __init__(self, host, maxsize=10, idle_timeout=60, timeout=None, limit=100):
+        """Initialize class."""
+        scheme, _, host = host.rpartition("://")
+        self.host = host
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.ssl_context = None if scheme == "http" else ssl.create_default_context()
+        self._idle = deque()
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def new_connection(self):
+        """Open a new connection to the host."""
+        host, _, port = self.host.partition(":")
+        default_port = 80 if self.ssl_context is None else 443
+        return await asyncio.open_connection(
+            host, int(port or default_port), ssl=self.ssl_context
+        )
+
+    async def get(self):
+        """Get a connection from the pool, opening a new one if none are idle.
+
+        Returns a `(connection, reused)` tuple.
+        """
+        now = time.monotonic()
+        while self._idle:
+            connection, released = self._idle.pop()
+            if now - released <= self.idle_timeout and not connection[0].at_eof():
+                return connection, True
+            connection[1].close()
+        return await self.new_connection(), False
+
+    def put(self, connection):
+        """Return a connection to the pool."""
+        if len(self._idle) < self.maxsize:
+            self._idle.append((connection, time.monotonic()))
+        else:
+            connection[1].close()
+
+    def make_request(self, method, url, body, headers):
+        """Serialize request line and headers."""
+        lines = [f"{method} {url} HTTP/1.1", f"Host: {self.host}"]
+        if "Accept-Encoding" not in headers:
+            lines.append("Accept-Encoding: identity")
+        if "Content-Length" not in headers:
+            if isinstance(body, bytes):
+                lines.append(f"Content-Length: {len(body)}")
+            elif body is None and method in {"POST", "PUT", "PATCH"}:
+                lines.append("Content-Length: 0")
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        return "\r\n".join([*lines, "", ""]).encode("iso-8859-1")
+
+    async def urlopen(self, method, url, body=None, headers=None, event=None):
+        """Send a request over a pooled connection.
+
+        If a reused connection turns out to be stale, the request is sent
+        once more on a fresh connection. Returns a `(response, data)` tuple.
+        Phase timings are added to the `RequestEvent` if given.
+        """
+        async with self._semaphore:
+            if self.timeout is None:
+                return await self._urlopen(method, url, body, headers or {}, event)
+            return await asyncio.wait_for(
+                self._urlopen(method, url, body, headers or {}, event), self.timeout
+            )
+
+    async def _urlopen(self, method, url, body, headers, event):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        request = self.make_request(method, url, body, headers)
+        position = body_position(body)
+        mark = time.perf_counter()
+        if body is None or isinstance(body, bytes) or position is not None:
+            connection, reused = await self.get()
+        else:
+            # a streamed body can't be sent twice, so don't risk a stale socket
+            connection, reused = await self.new_connection(), False
+        while True:
+            if event is not None:
+                mark = event.add_phase("connect", mark)
+            reader, writer = connection
+            try:
+                if body is None or isinstance(body, bytes):
+                    writer.write(request + body if body else request)
+                else:
+                    writer.write(request)
+                    for chunk in iter_body(body):
+                        writer.write(chunk)
+                        await writer.drain()
+                await writer.drain()
+                if event is not None:
+                    event.add_phase("send", mark)
+                response, data = await read_http_response(reader, method, event)
+            except self.stale_errors:
+                writer.close()
+                if not reused:
+                    raise
+                if position is not None:
+                    body.seek(position)
+                mark = time.perf_counter()
+                connection, reused = await self.new_connection(), False
+                continue
+            except BaseException:
+                # includes cancellation: the connection is in an unknown state
+                writer.close()
+                raise
+            break
+        if response.will_close:
+            writer.close()
+        else:
+            self.put(connection)
+        return response, data
+
+    async def close(self):
+        """Close all idle connections."""
+        idle = list(self._idle)
+        self._idle.clear()
+        for (_, writer), _ in idle:
+            writer.close()
+        for (_, writer), _ in idle:
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+class AsyncSauceClient(SauceClient):
+    """Asyncio SauceClient class.
+
+    Has the same resource attributes as `SauceClient` (`account`, `analytics`,
+    `information`, `javascript`, `jobs`, `storage`, `tunnels`), but every
+    method that calls the API returns a coroutine::
+
+        async with AsyncSauceClient("sauce-username", "sauce-access-key") as sc:
+            job = await sc.jobs.get_job("job-id")
+
+    Requests are sent over a non-blocking HTTP/1.1 transport that reuses
+    connections; at most `limit` requests are in flight at once.
+    """
+
+    def __init__(
+        self,
+        sauce_username=None,
+        sauce_access_key=None,
+        apibase=None,
+        pool_size=100,
+        pool_idle_timeout=60,
+        timeout=None,
+        retry=None,
+        rate_limiter=None,
+        cache=None,
+        compress_min_size=None,
+        limit=100,
+    ):
+        """Initialize class."""
+        self.limit = limit
+        super().__init__(
+            sauce_username,
+            sauce_access_key,
+            apibase,
+            pool_size=pool_size,
+            pool_idle_timeout=pool_idle_timeout,
+            timeout=timeout,
+            retry=retry,
+            rate_limiter=rate_limiter,
+            cache=cache,
+            compress_min_size=compress_min_size,
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def make_pool(self, pool_size, pool_idle_timeout, timeout):
+        """Create the connection pool used to send requests."""
+        return AsyncConnectionPool(
+            self.apibase,
+            maxsize=pool_size,
+            idle_timeout=pool_idle_timeout,
+            timeout=timeout,
+            limit=self.limit,
+        )
+
+    async def close(self):
+        """Close all pooled connections."""
+        await self.pool.close()
+
+    async def run_batch(self, func, calls, max_workers=8):
+        """Run a batch of API calls concurrently with `gather_batch`."""
+        return await gather_batch(func, calls, max_workers)
+
+    async def request(
+        self, method, url, body=None, content_type="application/json", headers=None
+    ):
+        """Send http request.
+
+        GET responses from endpoints configured in the client's `cache` are
+        served from it while fresh. Requests that reach the server are
+        reported to the client's `hooks` as a `RequestEvent`.
+        """
+        headers = {**self.get_header_template(content_type), **(headers or {})}
+        body = self.compress_body(body, headers)
+        ttl = entry = None
+        if self.cache is not None and method == "GET":
+            ttl = self.cache.get_ttl(url)
+        if ttl is not None:
+            entry = self.cache.get(url)
+            if entry is not None:
+                if entry.expires > time.time():
+                    return entry.value
+                headers.update(self.make_conditional_headers(entry))
+        if not self.hooks:
+            response, data = await self.send(method, url, body, headers)
+            return self.handle_cached_response(url, response, data, ttl, entry)
+        event = self.make_event(method, url, body, headers)
+        try:
+            response, data = await self.send(method, url, body, headers, event)
+            mark = time.perf_counter()
+            value = self.handle_cached_response(url, response, data, ttl, entry)
+            event.add_phase("decode", mark)
+            return value
+        except Exception as e:
+            event.error = e
+            raise
+        finally:
+            self.emit(event)
+
+    async def send(self, method, url, body=None, headers=None, event=None):
+        """Send http request, retrying failures.
+
+        Failed requests are retried according to the client's `retry`
+        policy, and every attempt waits for the `rate_limiter`, if any.
+        Returns a `(response, data)` tuple.
+        """
+        position = body_position(body)
+        replayable = is_replayable(body)
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                await asyncio.sleep(self.rate_limiter.reserve())
+            if event is not None:
+                event.attempts += 1
+            try:
+                response, data = await self.pool.urlopen(
+                    method, url, body, headers=headers, event=event
+                )
+            except (OSError, http_client.HTTPException, asyncio.TimeoutError):
+                if not (replayable and self.retry.is_retryable(method, attempt)):
+                    raise
+                delay = self.retry.get_backoff(attempt)
+            else:
+                if event is not None:
+                    event.status = response.status
+                if not (
+                    replayable
+                    and self.retry.is_retryable(method, attempt, response.status)
+                ):
+                    return response, data
+                delay = self.retry.get_backoff(attempt, response)
+            await asyncio.sleep(delay)
+            if position is not None:
+                body.seek(position)
+            attempt += 1
+
+    async def download(self, url, filepath, resume=True, chunk_size=CHUNK_SIZE):
+        """Download the body of a GET request to a file.
+
+        As `SauceClient.download`, except that the asyncio transport reads
+        response bodies in full, so the body is held in memory until it is
+        written.
+        """
+        headers, offset = self.make_download_headers(filepath, resume)
+        event = self.make_event("GET", url, None, headers) if self.hooks else None
+        with self.track(event):
+            response, data = await self.send("GET", url, None, headers, event)
+            if offset and response.status == 416:
+                # nothing left to fetch
+                return 0
+            self.check_response(response, (200, 206))
+            with Path(filepath).open("ab" if response.status == 206 else "wb") as f:
+                f.write(data)
+            return len(data)
+
+    async def stream(self, url, key=None, chunk_size=64 * 1024, factory=None):
+        """Send a GET request and yield the elements of the JSON array in
+        the response body.
+
+        The asyncio transport reads response bodies in full, so elements are
+        decoded one at a time, but only once the whole body has arrived.
+        """
+        headers = self.make_auth_headers("application/json")
+        event = self.make_event("GET", url, None, headers) if self.hooks else None
+        with self.track(event):
+            response, data = await self.send("GET", url, None, headers, event)
+            self.check_response(response)
+            chunks = (data[i : i + chunk_size] for i in range(0, len(data), chunk_size))
+            for item in iter_json_array(chunks, key):
+                yield item if factory is None else factory(item)
+
+
+class LazyJSON(str):
+    """Compact JSON text of a record field that has not been decoded yet."""
+
+    __slots__ = ()
+
+
+class Record:
+    """Compact, read-only view of an object returned by the API.
+
+    Fields are stored in `__slots__` instead of a per-object dict, and are
+    available both as attributes, with dashes in JSON keys replaced by
+    underscores, and by JSON key through a read-only mapping interface.
+    Fields that are missing or null are None, and are left out of `keys`.
+    Keys without a slot are kept in an extra dict, so nothing else in the
+    response is lost.
+
+    Nested values of `lazy` fields are kept as compact JSON text until first
+    accessed, and string values of `shared` fields, which repeat across
+    records, are interned. Subclasses are created with `record_type`.
+    """
+
+    __slots__ = ("_extra",)
+    slots = ()
+    lazy = ()
+    shared = ()
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+
+    def __init__(self, data):
+        """Initialize class."""
+        get = data.get
+        for key, slot in self.slots:
+            setattr(self, slot, get(key))
+        for key, slot in self.lazy:
+            value = get(key)
+            if isinstance(value, (dict, list)):
+                setattr(self, slot, LazyJSON(self.encode(value)))
+        for key, slot in self.shared:
+            value = get(key)
+            if type(value) is str:
+                setattr(self, slot, sys.intern(value))
+        self._extra = None
+        if not data.keys() <= self.fields.keys():
+            self._extra = {
+                key: value for key, value in data.items() if key not in self.fields
+            }
+
+    @classmethod
+    def from_list(cls, values):
+        """Create records from a list of dicts."""
+        return [cls(value) for value in values]
+
+    def __getitem__(self, key):
+        slot = self.fields.get(key)
+        if slot is None:
+            if self._extra is not None and key in self._extra:
+                return self._extra[key]
+            raise KeyError(key)
+        value = getattr(self, slot)
+        if isinstance(value, LazyJSON):
+            value = json.loads(value)
+            setattr(self, slot, value)
+        return value
+
+    def get(self, key, default=None):
+        """Get the value of a field by JSON key, or `default` if missing."""
+        try:
+            value = self[key]
+        except KeyError:
+            return default
+        return default if value is None else value
+
+    def keys(self):
+        """Get the JSON keys of the fields with values."""
+        keys = [
+            key for key, slot in self.fields.items() if getattr(self, slot) is not None
+        ]
+        if self._extra is not None:
+            keys.extend(self._extra)
+        return keys
+
+    def items(self):
+        """Get `(key, value)` pairs of the fields with values."""
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self):
+        """Convert the record back to a dict, decoding any lazy fields."""
+        return dict(self.items())
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, dict)):
+            return self.to_dict() == {
+                key: value for key, value in other.items() if value is not None
+            }
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def lazy_field(key):
+    """Create a property decoding a lazy record field on first access."""
+    return property(
+        lambda self: self[key], doc=f"The {key!r} field, decoded on first access."
+    )
+
+
+def record_type(name, fields, lazy=(), shared=(), doc=None):
+    """Create a `Record` subclass with a slot for each JSON key in `fields`.
+
+    Fields in `lazy` are decoded on first access, and string values of
+    fields in `shared` are interned.
+    """
+    slots = {
+        key: ("_" if key in lazy else "") + key.replace("-", "_") for key in fields
+    }
+    namespace = {
+        "__slots__": tuple(slots.values()),
+        "__module__": __name__,
+        "__doc__": doc,
+        "fields": slots,
+        "slots": tuple(slots.items()),
+        "lazy": tuple((key, slots[key]) for key in lazy),
+        "shared": tuple((key, slots[key]) for key in shared),
+    }
+    for key in lazy:
+        namespace[key.replace("-", "_")] = lazy_field(key)
+    return type(name, (Record,), namespace)
+
+
 class Account:
     """Account Methods
 
@@ -138,10 +2053,20 @@ class Account:
         return self.client.request(method, endpoint)
 
     def change_access_key(self):
-        """Change access key of your account."""
+        """Change access key of your account.
+
+        The client switches to the new access key from the response.
+        """
         method = "POST"
         endpoint = f"/rest/v1/users/{self.client.sauce_username}/accesskey/change"
-        return self.client.request(method, endpoint)
+        return map_result(self.client.request(method, endpoint), self.use_access_key)
+
+    def use_access_key(self, resp):
+        """Switch the client to the access key in a user response."""
+        access_key = resp.get("access_key") if isinstance(resp, dict) else None
+        if access_key:
+            self.client.sauce_access_key = access_key
+        return resp
 
     def get_activity(self):
         """Check account concurrency limits."""
@@ -163,15 +2088,378 @@ class Account:
         return self.client.request(method, endpoint)
 
 
+def parse_concurrency(resp):
+    """Get `(allowed, current)` overall session counts from the response of
+    `Account.get_concurrency`.
+    """
+    queue = deque([resp.get("concurrency", resp)])
+    while queue:
+        entry = queue.popleft()
+        if not isinstance(entry, dict):
+            continue
+        if "allowed" in entry or "remaining" in entry:
+            current = (entry.get("current") or {}).get("overall", 0)
+            if "allowed" in entry:
+                return entry["allowed"].get("overall", 0), current
+            return current + entry["remaining"].get("overall", 0), current
+        # prefer the user's own limits over those of parent accounts
+        if "self" in entry:
+            queue.appendleft(entry["self"])
+        else:
+            queue.extend(entry.values())
+    raise ValueError("no concurrency limits in response")
+
+
+class AdmissionController:
+    """Limits how many Sauce sessions are started at once.
+
+    Test workers acquire a slot before starting a session and release it
+    afterwards. The number of slots is the account's allowed concurrency
+    from `Account.get_concurrency`, minus the sessions it reports that were
+    not started through this controller. `reconcile` refreshes the number,
+    and runs automatically every `reconcile_interval` seconds.
+
+    If `directory` is given, slots are lock files in that directory, so the
+    limit is shared by all threads and processes on the host that use it
+    (this requires `fcntl`, i.e. a POSIX system). Otherwise, it is shared by
+    the threads of this process.
+    """
+
+    def __init__(
+        self,
+        client,
+        directory=None,
+        reconcile_interval=60.0,
+        poll_interval=0.5,
+    ):
+        """Initialize class."""
+        self.client = client
+        self.directory = directory
+        self.reconcile_interval = reconcile_interval
+        self.poll_interval = poll_interval
+        self.allowed = 0
+        self.capacity = 0
+        self.in_use = 0
+        self.reconciled = None
+        self._lock = threading.Lock()
+        self.fcntl = None
+        if directory is not None:
+            self.fcntl = import_optional("fcntl")
+            if self.fcntl is None:
+                raise RuntimeError("sharing slots between processes requires fcntl")
+            os.makedirs(directory, exist_ok=True)
+
+    def reconcile(self):
+        """Refresh the number of slots from the account's concurrency."""
+        allowed, current = parse_concurrency(self.client.account.get_concurrency())
+        held = self.count_held(allowed)
+        with self._lock:
+            self.allowed = allowed
+            self.capacity = max(0, allowed - max(0, current - held))
+            self.reconciled = time.monotonic()
+        return self.capacity
+
+    def count_held(self, limit):
+        """Count the slots currently held through this controller."""
+        if self.directory is None:
+            return self.in_use
+        return self._scan(limit)[0]
+
+    def _scan(self, limit, claim=False):
+        """Count the held slot files in the directory, including any at
+        indices of `limit` or more, left over from a larger capacity.
+
+        With `claim`, the lowest free slot below `limit` is also locked and
+        returned. Returns a `(held, slot)` tuple.
+        """
+        indices = set(range(limit))
+        for name in os.listdir(self.directory):
+            match = re.fullmatch(r"slot-(\d+)\.lock", name)
+            if match:
+                indices.add(int(match.group(1)))
+        held = 0
+        slot = None
+        for index in sorted(indices):
+            f = self._try_lock(index)
+            if f is None:
+                held += 1
+            elif claim and slot is None and index < limit:
+                slot = f
+            else:
+                self._unlock(f)
+        return held, slot
+
+    @contextmanager
+    def _directory_lock(self):
+        """Serialize slot scans between processes sharing the directory."""
+        with Path(self.directory, "admission.lock").open("a") as f:
+            self.fcntl.flock(f, self.fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                self.fcntl.flock(f, self.fcntl.LOCK_UN)
+
+    def _slot_path(self, index):
+        return os.path.join(self.directory, f"slot-{index}.lock")
+
+    def _try_lock(self, index):
+        f = Path(self._slot_path(index)).open("a")
+        try:
+            self.fcntl.flock(f, self.fcntl.LOCK_EX | self.fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return None
+        return f
+
+    def _unlock(self, f):
+        self.fcntl.flock(f, self.fcntl.LOCK_UN)
+        f.close()
+
+    def _maybe_reconcile(self):
+        if (
+            self.reconciled is None
+            or time.monotonic() - self.reconciled >= self.reconcile_interval
+        ):
+            self.reconcile()
+
+    def try_acquire(self):
+        """Take a free slot without waiting, or return None."""
+        self._maybe_reconcile()
+        with self._lock:
+            if self.directory is None:
+                if self.in_use >= self.capacity:
+                    return None
+                self.in_use += 1
+                return self.in_use
+            with self._directory_lock():
+                held, slot = self._scan(self.allowed, claim=True)
+                if slot is not None and held >= self.capacity:
+                    # slots freed above the capacity are not free
+                    self._unlock(slot)
+                    slot = None
+            if slot is not None:
+                self.in_use += 1
+            return slot
+
+    def acquire(self, timeout=None):
+        """Take a slot, waiting up to `timeout` seconds for one to be free.
+
+        Returns the slot, to be passed to `release`. Raises TimeoutError if
+        no slot became free in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while (slot := self.try_acquire()) is None:
+            delay = self.poll_interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("no session slot available")
+                delay = min(delay, remaining)
+            time.sleep(delay)
+        return slot
+
+    async def acquire_async(self, timeout=None):
+        """Take a slot from asyncio; see `acquire`."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while (slot := await asyncio.to_thread(self.try_acquire)) is None:
+            delay = self.poll_interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("no session slot available")
+                delay = min(delay, remaining)
+            await asyncio.sleep(delay)
+        return slot
+
+    def release(self, slot):
+        """Give back a slot taken with `acquire`."""
+        with self._lock:
+            self.in_use -= 1
+            if self.directory is not None:
+                self._unlock(slot)
+
+    @contextmanager
+    def session(self, timeout=None):
+        """Hold a slot for the duration of a `with` block."""
+        slot = self.acquire(timeout)
+        try:
+            yield slot
+        finally:
+            self.release(slot)
+
+    @asynccontextmanager
+    async def session_async(self, timeout=None):
+        """Hold a slot for the duration of an `async with` block."""
+        slot = await self.acquire_async(timeout)
+        try:
+            yield slot
+        finally:
+            self.release(slot)
+
+
+AnalyticsTest = record_type(
+    "AnalyticsTest",
+    [
+        "id",
+        "owner_id",
+        "org_id",
+        "team_id",
+        "ancestor",
+        "name",
+        "build",
+        "status",
+        "error",
+        "creation_time",
+        "start_time",
+        "end_time",
+        "duration",
+        "browser",
+        "browser_normalized",
+        "os",
+        "os_normalized",
+        "device",
+        "automation_backend",
+        "origin_site",
+        "rdc",
+        "tags",
+        "details_url",
+    ],
+    shared=[
+        "owner_id",
+        "org_id",
+        "team_id",
+        "name",
+        "build",
+        "status",
+        "error",
+        "browser",
+        "browser_normalized",
+        "os",
+        "os_normalized",
+        "device",
+        "automation_backend",
+        "origin_site",
+    ],
+    doc="""Test returned by `Analytics.get_tests` in model mode.""",
+)
+
+
+def analytics_tests(result):
+    """Convert the items of a `get_tests` result to `AnalyticsTest`s."""
+    return {**result, "items": AnalyticsTest.from_list(result.get("items") or [])}
+
+
+class QuerySpec:
+    """Declarative description of a GET endpoint and its query parameters.
+
+    `params` lists the argument names of the query, in the order they are
+    encoded. `aliases` maps argument names to query keys where they differ,
+    and `flags` are arguments sent with an empty value when true. Encoded
+    urls are memoized for the last `maxsize` distinct sets of values.
+    """
+
+    def __init__(self, path, params, flags=(), aliases=None, maxsize=1024):
+        """Initialize class."""
+        self.path = path
+        self.params = tuple((name, (aliases or {}).get(name, name)) for name in params)
+        self.flags = frozenset(flags)
+        self._encode = lru_cache(maxsize=maxsize, typed=True)(self._build)
+
+    def encode(self, params):
+        """Build the endpoint url for the values in the `params` mapping.
+
+        Missing, None and false values are left out, and names that are
+        not parameters of the query are ignored. Datetimes are sent as
+        ISO 8601 UTC strings.
+        """
+        values = tuple(params.get(name) for name, _ in self.params)
+        try:
+            hash(values)
+        except TypeError:
+            # not memoizable, and rejected with a clearer error by _build
+            return self._build(*values)
+        return self._encode(*values)
+
+    def _build(self, *values):
+        data = {}
+        for (name, key), value in zip(self.params, values, strict=True):
+            if not value:
+                continue
+            if name in self.flags:
+                data[key] = ""
+            elif isinstance(value, datetime):
+                data[key] = format_timestamp(value)
+            elif isinstance(value, (str, int, float)):
+                data[key] = value
+            else:
+                raise TypeError(
+                    f"{name} must be a string, number or datetime, "
+                    f"not {type(value).__name__}"
+                )
+        return "?".join([self.path, urlencode(data)])
+
+
 class Analytics:
     """Analytics Methods
 
     These methods provide user account information and management.
     - https://wiki.saucelabs.com/display/DOCS/Analytics+Methods
+
+    With `models`, tests are returned as `AnalyticsTest` records.
     """
 
-    def __init__(self, client):
+    time_params = ("time_range", "start", "end")
+    test_trends_query = QuerySpec(
+        "/rest/v1/analytics/trends/tests",
+        [
+            *time_params,
+            "interval",
+            "scope",
+            "owner",
+            "status",
+            "pretty",
+            "os",
+            "browser",
+        ],
+        flags=["pretty"],
+    )
+    error_trends_query = QuerySpec(
+        "/rest/v1/analytics/trends/errors",
+        [*time_params, "scope", "owner", "status", "pretty", "os", "browser"],
+        flags=["pretty"],
+    )
+    build_trends_query = QuerySpec(
+        "/rest/v1/analytics/trends/builds_tests",
+        [*time_params, "scope", "owner", "status", "pretty", "os", "browser"],
+        flags=["pretty"],
+    )
+    tests_query = QuerySpec(
+        "/rest/v1/analytics/tests",
+        [
+            *time_params,
+            "size",
+            "scope",
+            "owner",
+            "status",
+            "pretty",
+            "error",
+            "build",
+            "skip",
+            "missing_build",
+        ],
+        flags=["pretty", "missing_build"],
+        # from is a reserved keyword, using skip instead
+        aliases={"skip": "from"},
+    )
+    concurrency_query = QuerySpec(
+        "/rest/v1/analytics/insights/concurrency",
+        [*time_params, "interval", "scope", "owner", "status", "pretty"],
+        flags=["pretty"],
+    )
+
+    def __init__(self, client, models=False):
         self.client = client
+        self.models = models
 
     def get_test_trends(
         self,
@@ -185,34 +2473,24 @@ class Analytics:
         pretty=False,
         os=None,
         browser=None,
+        frame=False,
     ):
-        method = "GET"
-        endpoint = "/rest/v1/analytics/trends/tests"
-        data = {}
-
-        if time_range:
-            data["time_range"] = time_range
-        if start:
-            data["start"] = start
-        if end:
-            data["end"] = end
-        if interval:
-            data["interval"] = interval
-        if scope:
-            data["scope"] = scope
-        if owner:
-            data["owner"] = owner
-        if status:
-            data["status"] = status
-        if pretty:
-            data["pretty"] = ""
-        if os:
-            data["os"] = os
-        if browser:
-            data["browser"] = browser
-
-        endpoint = "?".join([endpoint, urlencode(data)])
-        return self.client.request(method, endpoint)
+        endpoint = self.test_trends_query.encode(
+            dict(
+                start=start,
+                end=end,
+                interval=interval,
+                time_range=time_range,
+                scope=scope,
+                owner=owner,
+                status=status,
+                pretty=pretty,
+                os=os,
+                browser=browser,
+            )
+        )
+        result = self.client.request("GET", endpoint)
+        return map_result(result, ColumnFrame.from_payload) if frame else result
 
     def get_error_trends(
         self,
@@ -225,32 +2503,23 @@ class Analytics:
         pretty=False,
         os=None,
         browser=None,
+        frame=False,
     ):
-        method = "GET"
-        endpoint = "/rest/v1/analytics/trends/errors"
-        data = {}
-
-        if time_range:
-            data["time_range"] = time_range
-        if start:
-            data["start"] = start
-        if end:
-            data["end"] = end
-        if scope:
-            data["scope"] = scope
-        if owner:
-            data["owner"] = owner
-        if status:
-            data["status"] = status
-        if pretty:
-            data["pretty"] = ""
-        if os:
-            data["os"] = os
-        if browser:
-            data["browser"] = browser
-
-        endpoint = "?".join([endpoint, urlencode(data)])
-        return self.client.request(method, endpoint)
+        endpoint = self.error_trends_query.encode(
+            dict(
+                start=start,
+                end=end,
+                time_range=time_range,
+                scope=scope,
+                owner=owner,
+                status=status,
+                pretty=pretty,
+                os=os,
+                browser=browser,
+            )
+        )
+        result = self.client.request("GET", endpoint)
+        return map_result(result, ColumnFrame.from_payload) if frame else result
 
     def get_build_trends(
         self,
@@ -263,32 +2532,23 @@ class Analytics:
         pretty=False,
         os=None,
         browser=None,
+        frame=False,
     ):
-        method = "GET"
-        endpoint = "/rest/v1/analytics/trends/builds_tests"
-        data = {}
-
-        if time_range:
-            data["time_range"] = time_range
-        if start:
-            data["start"] = start
-        if end:
-            data["end"] = end
-        if scope:
-            data["scope"] = scope
-        if owner:
-            data["owner"] = owner
-        if status:
-            data["status"] = status
-        if pretty:
-            data["pretty"] = ""
-        if os:
-            data["os"] = os
-        if browser:
-            data["browser"] = browser
-
-        endpoint = "?".join([endpoint, urlencode(data)])
-        return self.client.request(method, endpoint)
+        endpoint = self.build_trends_query.encode(
+            dict(
+                start=start,
+                end=end,
+                time_range=time_range,
+                scope=scope,
+                owner=owner,
+                status=status,
+                pretty=pretty,
+                os=os,
+                browser=browser,
+            )
+        )
+        result = self.client.request("GET", endpoint)
+        return map_result(result, ColumnFrame.from_payload) if frame else result
 
     def get_tests(
         self,
@@ -301,43 +2561,32 @@ class Analytics:
         status=None,
         pretty=False,
         error=None,
-        build=None,
-        skip=None,
-        missing_build=False,
-    ):
-
-        method = "GET"
-        endpoint = "/rest/v1/analytics/tests"
-        data = {}
-
-        if time_range:
-            data["time_range"] = time_range
-        if start:
-            data["start"] = start
-        if end:
-            data["end"] = end
-        if size:
-            data["size"] = size
-        if scope:
-            data["scope"] = scope
-        if owner:
-            data["owner"] = owner
-        if status:
-            data["status"] = status
-        if pretty:
-            data["pretty"] = ""
-        if error:
-            data["error"] = error
-        if build:
-            data["build"] = build
-        # from is a reserved keyword, using skip instead
-        if skip:
-            data["from"] = skip
-        if missing_build:
-            data["missing_build"] = ""
-
-        endpoint = "?".join([endpoint, urlencode(data)])
-        return self.client.request(method, endpoint)
+        build=None,
+        skip=None,
+        missing_build=False,
+        stream=False,
+    ):
+        endpoint = self.tests_query.encode(
+            dict(
+                start=start,
+                end=end,
+                size=size,
+                time_range=time_range,
+                scope=scope,
+                owner=owner,
+                status=status,
+                pretty=pretty,
+                error=error,
+                build=build,
+                skip=skip,
+                missing_build=missing_build,
+            )
+        )
+        if stream:
+            factory = AnalyticsTest if self.models else None
+            return self.client.stream(endpoint, key="items", factory=factory)
+        result = self.client.request("GET", endpoint)
+        return map_result(result, analytics_tests) if self.models else result
 
     def get_concurrency(
         self,
@@ -349,31 +2598,273 @@ class Analytics:
         owner=None,
         status=None,
         pretty=False,
+        frame=False,
     ):
+        endpoint = self.concurrency_query.encode(
+            dict(
+                start=start,
+                end=end,
+                interval=interval,
+                time_range=time_range,
+                scope=scope,
+                owner=owner,
+                status=status,
+                pretty=pretty,
+            )
+        )
+        result = self.client.request("GET", endpoint)
+        return map_result(result, ColumnFrame.from_payload) if frame else result
 
-        method = "GET"
-        endpoint = "/rest/v1/analytics/insights/concurrency"
-        data = {}
+    def iter_tests(
+        self, start, end, shards=8, max_workers=4, size=1000, prefetch=2, **filters
+    ):
+        """Iterate over the tests run between `start` and `end`.
 
-        if time_range:
-            data["time_range"] = time_range
-        if start:
-            data["start"] = start
-        if end:
-            data["end"] = end
-        if interval:
-            data["interval"] = interval
-        if scope:
-            data["scope"] = scope
-        if owner:
-            data["owner"] = owner
-        if status:
-            data["status"] = status
-        if pretty:
-            data["pretty"] = ""
-
-        endpoint = "?".join([endpoint, urlencode(data)])
-        return self.client.request(method, endpoint)
+        The time range is split into `shards` equal windows, which are paged
+        through with `get_tests` on at most `max_workers` threads. Windows
+        are yielded oldest first, and tests within a window in the order the
+        API returns them, page by page as they arrive. Each window buffers at
+        most `prefetch` pages of `size` tests ahead of the consumer, so memory
+        use doesn't grow with the number of tests. Tests outside their window,
+        such as repeats at a boundary, are skipped. `start` and `end` are
+        datetimes, Unix times or ISO 8601 strings; `filters` are passed on to
+        `get_tests`. With `AsyncSauceClient`, an async iterator is returned,
+        to be used with `async for`.
+        """
+        start = parse_timestamp(start)
+        step = (parse_timestamp(end) - start) / shards
+        # the API takes whole seconds, so split on what it will be sent
+        bounds = [
+            parse_timestamp(format_timestamp(start + step * i))
+            for i in range(shards + 1)
+        ]
+        windows = list(pairwise(bounds))
+        last = bounds[-1]
+
+        def in_window(item, window):
+            created = item.get("creation_time")
+            if created is None:
+                return True
+            created = parse_timestamp(created)
+            return window[0] <= created and (
+                created < window[1] or created == window[1] == last
+            )
+
+        def window_pages(window):
+            skip = 0
+            while True:
+                page = self.get_tests(
+                    start=format_timestamp(window[0]),
+                    end=format_timestamp(window[1]),
+                    size=size,
+                    skip=skip,
+                    **filters,
+                )
+                batch = page.get("items") or []
+                skip += len(batch)
+                yield [item for item in batch if in_window(item, window)]
+                if not batch or not page.get("has_more"):
+                    return
+
+        async def window_pages_async(window):
+            skip = 0
+            while True:
+                page = await self.get_tests(
+                    start=format_timestamp(window[0]),
+                    end=format_timestamp(window[1]),
+                    size=size,
+                    skip=skip,
+                    **filters,
+                )
+                batch = page.get("items") or []
+                skip += len(batch)
+                yield [item for item in batch if in_window(item, window)]
+                if not batch or not page.get("has_more"):
+                    return
+
+        if inspect.iscoroutinefunction(self.client.request):
+            sources = (window_pages_async(window) for window in windows)
+            return aiter_batches(sources, max_workers, prefetch)
+        sources = (window_pages(window) for window in windows)
+        return iter_batches(sources, max_workers, prefetch)
+
+
+def parse_timestamp(value):
+    """Convert a datetime, Unix time or ISO 8601 string to an aware datetime."""
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, timezone.utc)
+    return parse_timestamp(datetime.fromisoformat(value.replace("Z", "+00:00")))
+
+
+def format_timestamp(value):
+    """Format a datetime as an ISO 8601 UTC string for the analytics API."""
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def import_optional(name):
+    """Import an optional dependency, or return None if it isn't installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def flatten_record(record, prefix=""):
+    """Flatten nested dicts into a single dict with dotted keys."""
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            flat.update(flatten_record(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+class ColumnFrame:
+    """Columnar table built from analytics results.
+
+    Numeric columns are stored as `array.array("d")`, with NaN for missing
+    values, and other columns as lists. Nested fields are flattened into
+    dotted column names, e.g. "aggs.status.failed". `to_numpy` and
+    `to_pandas` export the columns when those packages are installed.
+    """
+
+    def __init__(self, columns=None):
+        """Initialize class."""
+        self.columns = columns or {}
+
+    @classmethod
+    def from_records(cls, records):
+        """Create a frame from a list of (possibly nested) dicts."""
+        records = [flatten_record(record) for record in records]
+        names = list(dict.fromkeys(name for record in records for name in record))
+        return cls.from_columns(
+            {name: [record.get(name) for record in records] for name in names}
+        )
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Create a frame from a dict of equal-length lists."""
+        frame = {}
+        for name, values in columns.items():
+            if all(
+                isinstance(value, (int, float)) or value is None for value in values
+            ):
+                frame[name] = array.array(
+                    "d", (float("nan") if value is None else value for value in values)
+                )
+            else:
+                frame[name] = list(values)
+        return cls(frame)
+
+    @classmethod
+    def from_payload(cls, payload):
+        """Create a frame from an analytics response.
+
+        Uses the first list of records found in the response (such as
+        "buckets" or "items"), or the first dict of equal-length lists.
+        """
+        queue = deque([payload])
+        while queue:
+            value = queue.popleft()
+            if isinstance(value, list) and all(isinstance(v, dict) for v in value):
+                return cls.from_records(value)
+            if not isinstance(value, dict):
+                continue
+            lists = [v for v in value.values() if isinstance(v, list)]
+            if (
+                lists
+                and len(lists) == len(value)
+                and len({len(v) for v in lists}) == 1
+                and not any(isinstance(v, dict) for v in lists[0])
+            ):
+                return cls.from_columns(value)
+            queue.extend(value.values())
+        return cls()
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()), ()))
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def ratio(self, numerator, denominator):
+        """Divide one numeric column by another, with NaN for zero.
+
+        Uses NumPy when installed.
+        """
+        a, b = self[numerator], self[denominator]
+        numpy = import_optional("numpy")
+        if (
+            numpy is not None
+            and isinstance(a, array.array)
+            and isinstance(b, array.array)
+        ):
+            if len(a) != len(b):
+                raise ValueError("columns have different lengths")
+            a = numpy.frombuffer(a, dtype=numpy.float64)
+            b = numpy.frombuffer(b, dtype=numpy.float64)
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                ratios = numpy.where(b != 0, a / b, numpy.nan)
+            return array.array("d", ratios.tobytes())
+        nan = float("nan")
+        return array.array(
+            "d",
+            (
+                a / b if b else nan
+                for a, b in zip(self[numerator], self[denominator], strict=True)
+            ),
+        )
+
+    def group_sum(self, key, value):
+        """Sum a numeric column for each distinct value of the `key` column.
+
+        Uses NumPy when installed.
+        """
+        numpy = import_optional("numpy")
+        if numpy is not None:
+            try:
+                keys, inverse = numpy.unique(self[key], return_inverse=True)
+            except TypeError:
+                # unorderable keys, e.g. a mix of None and strings
+                pass
+            else:
+                values = numpy.frombuffer(self[value], dtype=numpy.float64)
+                sums = numpy.bincount(inverse, weights=numpy.nan_to_num(values))
+                return dict(zip(keys.tolist(), sums.tolist(), strict=True))
+        sums = {}
+        for k, v in zip(self[key], self[value], strict=True):
+            if v == v:  # skip NaN
+                sums[k] = sums.get(k, 0.0) + v
+            else:
+                sums.setdefault(k, 0.0)
+        return sums
+
+    def to_numpy(self):
+        """Get the columns as a dict of NumPy arrays."""
+        numpy = import_optional("numpy")
+        if numpy is None:
+            raise ImportError("to_numpy requires numpy")
+        return {
+            name: (
+                numpy.frombuffer(column, dtype=numpy.float64).copy()
+                if isinstance(column, array.array)
+                else numpy.asarray(column, dtype=object)
+            )
+            for name, column in self.columns.items()
+        }
+
+    def to_pandas(self):
+        """Get the columns as a pandas DataFrame."""
+        pandas = import_optional("pandas")
+        if pandas is None:
+            raise ImportError("to_pandas requires pandas")
+        return pandas.DataFrame(self.to_numpy())
 
 
 class Information:
@@ -410,6 +2901,173 @@ class Information:
         endpoint = "/rest/v1/info/platforms/appium/eol"
         return self.client.request(method, endpoint)
 
+    def get_platform_catalog(self, automation_api="all", drop_eol=True):
+        """Get a `PlatformCatalog` of the platforms currently supported on
+        Sauce Labs, leaving out end-of-life Appium platforms unless
+        `drop_eol` is False.
+        """
+        platforms = self.get_platforms(automation_api)
+        eol_dates = self.get_appium_eol_dates() if drop_eol else None
+        if inspect.isawaitable(platforms):
+            return self._get_platform_catalog_async(platforms, eol_dates)
+        return PlatformCatalog(platforms, eol_dates)
+
+    async def _get_platform_catalog_async(self, platforms, eol_dates):
+        if eol_dates is None:
+            return PlatformCatalog(await platforms)
+        return PlatformCatalog(*await asyncio.gather(platforms, eol_dates))
+
+
+Platform = namedtuple(
+    "Platform",
+    [
+        "api_name",
+        "os",
+        "short_version",
+        "long_name",
+        "long_version",
+        "automation_backend",
+        "device",
+        "backend_versions",
+    ],
+)
+Platform.__doc__ = """Platform entry in a `PlatformCatalog`."""
+
+
+def version_key(version):
+    """Create a sort key from a version string like "16.2", or None if the
+    version isn't numeric (e.g. "beta").
+    """
+    try:
+        return tuple(int(part) for part in str(version).strip(".").split("."))
+    except ValueError:
+        return None
+
+
+class PlatformCatalog:
+    """Indexed catalog of the platforms returned by
+    `Information.get_platforms`.
+
+    Platforms are indexed once by api_name, os and device, and kept sorted
+    by version per api_name and per (api_name, os), so version queries are
+    answered with a binary search. If `eol_dates` from
+    `Information.get_appium_eol_dates` is given, Appium platforms whose
+    supported Appium versions have all reached end-of-life are left out.
+    """
+
+    def __init__(self, platforms, eol_dates=None, now=None):
+        """Initialize class."""
+        now = time.time() if now is None else now
+        eol = {
+            version
+            for version, date in (eol_dates or {}).items()
+            if date is not None and date <= now
+        }
+        self.platforms = []
+        self._by_field = {"api_name": {}, "os": {}, "device": {}}
+        self._by_version = {}
+        for entry in platforms:
+            backend_versions = tuple(entry.get("supported_backend_versions") or ())
+            if backend_versions and eol.issuperset(backend_versions):
+                continue
+            platform = Platform(
+                *(
+                    sys.intern(entry[field]) if entry.get(field) else None
+                    for field in Platform._fields[:-1]
+                ),
+                backend_versions,
+            )
+            index = len(self.platforms)
+            self.platforms.append(platform)
+            for field, values in self._by_field.items():
+                value = getattr(platform, field)
+                if value is not None:
+                    values.setdefault(value, []).append(index)
+            key = version_key(platform.short_version)
+            if key is not None and platform.api_name is not None:
+                for group in (platform.api_name, (platform.api_name, platform.os)):
+                    self._by_version.setdefault(group, []).append((key, index))
+        for entries in self._by_version.values():
+            entries.sort()
+
+    def __len__(self):
+        return len(self.platforms)
+
+    def __iter__(self):
+        return iter(self.platforms)
+
+    def find(
+        self,
+        api_name=None,
+        os=None,
+        device=None,
+        min_version=None,
+        max_version=None,
+    ):
+        """Find platforms matching all the given criteria.
+
+        Versions are compared numerically, so platforms with a non-numeric
+        version are left out when `min_version` or `max_version` is given,
+        and a non-numeric bound raises ValueError. Version queries are sorted
+        by version.
+        """
+        if min_version is None and max_version is None:
+            indices = self._lookup(api_name=api_name, os=os, device=device)
+            return [self.platforms[index] for index in indices]
+        for bound in (min_version, max_version):
+            if bound is not None and version_key(bound) is None:
+                raise ValueError(f"version bounds must be numeric, not {bound!r}")
+        low = () if min_version is None else version_key(min_version)
+        high = None if max_version is None else version_key(max_version)
+        if api_name is not None:
+            entries = self._by_version.get(api_name if os is None else (api_name, os))
+            entries = entries or []
+            start = bisect.bisect_left(entries, (low,))
+            end = len(entries)
+            if high is not None:
+                # (key, inf) sorts after every (key, index) with the same key
+                end = bisect.bisect_right(entries, (high, float("inf")))
+            platforms = [self.platforms[index] for _, index in entries[start:end]]
+            if device is None:
+                return platforms
+            return [platform for platform in platforms if platform.device == device]
+        matches = []
+        for index in self._lookup(os=os, device=device):
+            key = version_key(self.platforms[index].short_version)
+            if key is not None and key >= low and (high is None or key <= high):
+                matches.append((key, index))
+        return [self.platforms[index] for _, index in sorted(matches)]
+
+    def latest(self, api_name, os=None, count=1):
+        """Get the `count` newest versions of a platform, newest first.
+
+        One platform is returned per distinct version; without `os`, it is
+        the last one listed for that version on any os.
+        """
+        group = api_name if os is None else (api_name, os)
+        latest = []
+        seen = None
+        for key, index in reversed(self._by_version.get(group, [])):
+            if len(latest) >= count:
+                break
+            if key != seen:
+                latest.append(self.platforms[index])
+                seen = key
+        return latest
+
+    def _lookup(self, **criteria):
+        indices = None
+        for field, value in criteria.items():
+            if value is None:
+                continue
+            matches = self._by_field[field].get(value, [])
+            if indices is None:
+                indices = matches
+            else:
+                matching = set(matches)
+                indices = [index for index in indices if index in matching]
+        return range(len(self.platforms)) if indices is None else indices
+
 
 class JavaScriptTests:
     """JavaScript Unit Testing Methods
@@ -447,15 +3105,171 @@ class JavaScriptTests:
         return self.client.request(method, endpoint, body)
 
 
+class JavaScriptTestRunner:
+    """Runs JavaScript unit tests and polls their status in batches.
+
+    `submit` starts tests with `JavaScriptTests.js_tests` and returns a
+    `concurrent.futures.Future` per test. Each `poll` checks every
+    outstanding test with `js_tests_status`, in groups of up to
+    `batch_size` tests per call, and resolves the futures of finished tests
+    with their status entry. `as_completed` keeps polling and yields the
+    status entries in the order tests finish. It waits `min_interval`
+    seconds between polls. The wait grows by `backoff` times after each
+    poll where nothing finished, up to `max_interval`, and drops back once
+    a test finishes.
+    """
+
+    def __init__(
+        self,
+        client,
+        min_interval=1.0,
+        max_interval=30.0,
+        backoff=1.5,
+        batch_size=100,
+    ):
+        """Initialize class."""
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.batch_size = batch_size
+        self.interval = min_interval
+        self.pending = {}
+
+    def submit(self, platforms, url, framework):
+        """Start tests on `platforms` and get a future for each one."""
+        resp = self.client.javascript.js_tests(platforms, url, framework)
+        futures = []
+        for test_id in resp.get("js tests", []):
+            future = Future()
+            future.set_running_or_notify_cancel()
+            self.pending[test_id] = future
+            futures.append(future)
+        return futures
+
+    def poll(self):
+        """Check all outstanding tests once.
+
+        Returns the status entries of the tests that finished.
+        """
+        finished = []
+        test_ids = list(self.pending)
+        for i in range(0, len(test_ids), self.batch_size):
+            resp = self.client.javascript.js_tests_status(
+                test_ids[i : i + self.batch_size]
+            )
+            for entry in resp.get("js tests", []):
+                if entry.get("result") is None:
+                    continue
+                future = self.pending.pop(entry.get("id"), None)
+                if future is not None:
+                    future.set_result(entry)
+                    finished.append(entry)
+        if finished:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        return finished
+
+    def as_completed(self, timeout=None):
+        """Poll until all tests finish, yielding status entries as they do.
+
+        Raises TimeoutError if tests are still running after `timeout`
+        seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending:
+            yield from self.poll()
+            if not self.pending:
+                return
+            delay = self.interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"{len(self.pending)} tests still running")
+                delay = min(delay, remaining)
+            time.sleep(delay)
+
+
+Job = record_type(
+    "Job",
+    [
+        "id",
+        "owner",
+        "name",
+        "build",
+        "status",
+        "consolidated_status",
+        "passed",
+        "error",
+        "public",
+        "tags",
+        "custom-data",
+        "browser",
+        "browser_version",
+        "browser_short_version",
+        "os",
+        "automation_backend",
+        "selenium_version",
+        "creation_time",
+        "start_time",
+        "end_time",
+        "modification_time",
+        "deletion_time",
+        "commands_not_successful",
+        "command_counts",
+        "manual",
+        "proxied",
+        "proxy_host",
+        "record_screenshots",
+        "record_video",
+        "video_url",
+        "log_url",
+        "video_secret",
+        "breakpointed",
+        "assigned_tunnel_id",
+        "container",
+        "collects_automator_log",
+        "base_config",
+    ],
+    lazy=["custom-data", "command_counts", "base_config"],
+    shared=[
+        "owner",
+        "name",
+        "build",
+        "status",
+        "consolidated_status",
+        "public",
+        "browser",
+        "browser_version",
+        "browser_short_version",
+        "os",
+        "automation_backend",
+        "selenium_version",
+    ],
+    doc="""Job returned by `Jobs` methods in model mode.""",
+)
+
+
 class Jobs:
     """Job Methods
 
     - https://wiki.saucelabs.com/display/DOCS/Job+Methods
+
+    With `models`, jobs are returned as `Job` records. Combined with
+    `stream`, the decoded dicts are never held at once.
     """
 
-    def __init__(self, client):
+    def __init__(self, client, models=False):
         """Initialize class."""
         self.client = client
+        self.models = models
+
+    def to_models(self, result, many=False):
+        """Convert a request result to `Job` records in model mode."""
+        if not self.models:
+            return result
+        return map_result(result, Job.from_list if many else Job)
 
     def get_jobs(
         self,
@@ -466,8 +3280,13 @@ class Jobs:
         end=None,
         job_name=None,
         output_format=None,
+        stream=False,
     ):
-        """List jobs belonging to a specific user."""
+        """List jobs belonging to a specific user.
+
+        With `stream`, a generator yielding jobs as they are decoded from
+        the response is returned instead of a list.
+        """
         method = "GET"
         endpoint = f"/rest/v1/{self.client.sauce_username}/jobs"
         data = {}
@@ -487,13 +3306,46 @@ class Jobs:
             data["format"] = output_format
         if data:
             endpoint = "?".join([endpoint, urlencode(data)])
-        return self.client.request(method, endpoint)
+        if stream:
+            return self.client.stream(endpoint, factory=Job if self.models else None)
+        return self.to_models(self.client.request(method, endpoint), many=True)
+
+    def iter_jobs(
+        self,
+        full=None,
+        start=None,
+        end=None,
+        job_name=None,
+        page_size=100,
+        prefetch=1,
+    ):
+        """Iterate over jobs belonging to a specific user, one job at a time.
+
+        Pages of `page_size` jobs are fetched lazily with `get_jobs`, and up
+        to `prefetch` following pages are requested in the background while
+        the current page is consumed. With `AsyncSauceClient`, an async
+        iterator is returned, to be used with `async for`.
+        """
+
+        def fetch(skip):
+            return self.get_jobs(
+                full=full,
+                limit=page_size,
+                skip=skip,
+                start=start,
+                end=end,
+                job_name=job_name,
+            )
+
+        if inspect.iscoroutinefunction(self.client.request):
+            return aiter_pages(fetch, page_size, prefetch)
+        return iter_pages(fetch, page_size, prefetch)
 
     def get_job(self, job_id):
         """Retreive a single job."""
         method = "GET"
         endpoint = f"/rest/v1/{self.client.sauce_username}/jobs/{job_id}"
-        return self.client.request(method, endpoint)
+        return self.to_models(self.client.request(method, endpoint))
 
     def update_job(
         self,
@@ -522,7 +3374,7 @@ class Jobs:
         if tags is not None:
             data["tags"] = tags
         body = json.dumps(data)
-        return self.client.request(method, endpoint, body=body)
+        return self.to_models(self.client.request(method, endpoint, body=body))
 
     def delete_job(self, job_id):
         """Removes the job from the system with all the linked assets."""
@@ -534,7 +3386,7 @@ class Jobs:
         """Terminates a running job."""
         method = "PUT"
         endpoint = f"/rest/v1/{self.client.sauce_username}/jobs/{job_id}/stop"
-        return self.client.request(method, endpoint)
+        return self.to_models(self.client.request(method, endpoint))
 
     def get_job_assets(self, job_id):
         """Get details about the static assets collected for a specific job."""
@@ -546,12 +3398,115 @@ class Jobs:
         """Get details about the static assets collected for a specific job."""
         return f"https://saucelabs.com/rest/v1/{self.client.sauce_username}/jobs/{job_id}/assets/{filename}"
 
+    def download_job_asset(self, job_id, filename, filepath, resume=True):
+        """Download a single job asset to a file, streaming it in chunks.
+
+        Returns the number of bytes written.
+        """
+        endpoint = (
+            f"/rest/v1/{self.client.sauce_username}/jobs/{job_id}/assets/{filename}"
+        )
+        return self.client.download(endpoint, filepath, resume=resume)
+
+    def download_job_assets(
+        self, job_ids, directory, assets=None, max_workers=8, resume=True
+    ):
+        """Download the assets of many jobs concurrently.
+
+        Assets are saved as `<directory>/<job_id>/<filename>`. `assets` limits
+        the download to the given asset keys (e.g. "sauce-log", "video") or
+        filename patterns (e.g. "*.json"). Returns `(results, errors)` dicts
+        keyed by job ID; results map each filename to the bytes written.
+        """
+
+        def prepare(job_id, job_assets):
+            filenames = []
+            for key, value in job_assets.items():
+                if isinstance(value, str):
+                    value = [value]
+                elif not isinstance(value, list):
+                    continue
+                for filename in value:
+                    if filename in filenames:
+                        continue
+                    if assets is None or any(
+                        key == pattern or fnmatch.fnmatch(filename, pattern)
+                        for pattern in assets
+                    ):
+                        filenames.append(filename)
+            job_directory = os.path.join(directory, job_id)
+            os.makedirs(job_directory, exist_ok=True)
+            return [
+                (filename, os.path.join(job_directory, os.path.basename(filename)))
+                for filename in filenames
+            ]
+
+        def download(job_id):
+            return {
+                filename: self.download_job_asset(job_id, filename, path, resume)
+                for filename, path in prepare(job_id, self.get_job_assets(job_id))
+            }
+
+        async def download_async(job_id):
+            job_assets = await self.get_job_assets(job_id)
+            return {
+                filename: await self.download_job_asset(job_id, filename, path, resume)
+                for filename, path in prepare(job_id, job_assets)
+            }
+
+        if inspect.iscoroutinefunction(self.client.request):
+            download = download_async
+        calls = ((job_id, {}) for job_id in job_ids)
+        return self.client.run_batch(download, calls, max_workers)
+
     def delete_job_assets(self, job_id):
         """Delete all the assets captured during a test run."""
         method = "DELETE"
         endpoint = f"/rest/v1/{self.client.sauce_username}/jobs/{job_id}/assets"
         return self.client.request(method, endpoint)
 
+    def update_jobs(self, jobs, max_workers=8, **fields):
+        """Edit many existing jobs concurrently.
+
+        `jobs` is an iterable of job IDs, or of dicts with a "job_id" key and
+        any other `update_job` arguments. Keyword arguments are applied to
+        every job. Returns `(results, errors)` dicts keyed by job ID.
+        """
+
+        def calls():
+            for job in jobs:
+                if isinstance(job, dict):
+                    job = dict(job)
+                    yield job.pop("job_id"), {**fields, **job}
+                else:
+                    yield job, fields
+
+        return self.client.run_batch(self.update_job, calls(), max_workers)
+
+    def delete_jobs(self, job_ids, max_workers=8):
+        """Remove many jobs concurrently.
+
+        Returns `(results, errors)` dicts keyed by job ID.
+        """
+        calls = ((job_id, {}) for job_id in job_ids)
+        return self.client.run_batch(self.delete_job, calls, max_workers)
+
+    def stop_jobs(self, job_ids, max_workers=8):
+        """Terminate many running jobs concurrently.
+
+        Returns `(results, errors)` dicts keyed by job ID.
+        """
+        calls = ((job_id, {}) for job_id in job_ids)
+        return self.client.run_batch(self.stop_job, calls, max_workers)
+
+    def delete_jobs_assets(self, job_ids, max_workers=8):
+        """Delete the assets of many jobs concurrently.
+
+        Returns `(results, errors)` dicts keyed by job ID.
+        """
+        calls = ((job_id, {}) for job_id in job_ids)
+        return self.client.run_batch(self.delete_job_assets, calls, max_workers)
+
     def get_auth_token(self, job_id, date_range=None):
         """Get an auth token to access protected job resources.
 
@@ -563,44 +3518,527 @@ class Jobs:
         return hmac.new(key.encode("utf-8"), job_id.encode("utf-8"), md5).hexdigest()
 
 
+class JobWatcher:
+    """Watches jobs until they reach a terminal state.
+
+    Each `poll` lists the newest jobs with `Jobs.get_jobs(full=True)`, in
+    up to `max_pages` pages of `page_size` jobs, and stops as soon as every
+    watched job has been seen. Watched jobs that are not in those pages are
+    then fetched one by one with `Jobs.get_job`. When a job finishes, its
+    future is resolved and `callback(job)` is called, if given. If fetching
+    a job fails, its future gets the exception and it is no longer watched.
+
+    Use `as_completed` to block until all jobs finish, or `async for` to
+    wait for them from asyncio.
+    """
+
+    terminal_statuses = frozenset({"complete", "error", "failed", "passed"})
+
+    def __init__(
+        self,
+        client,
+        job_ids=(),
+        interval=5.0,
+        page_size=100,
+        max_pages=5,
+        callback=None,
+    ):
+        """Initialize class."""
+        self.client = client
+        self.interval = interval
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.callback = callback
+        self.pending = {}
+        self._lock = threading.Lock()
+        for job_id in job_ids:
+            self.add(job_id)
+
+    def add(self, job_id):
+        """Start watching a job, returning a future for its final state."""
+        with self._lock:
+            future = self.pending.get(job_id)
+            if future is None:
+                future = self.pending[job_id] = Future()
+                future.set_running_or_notify_cancel()
+        return future
+
+    def poll(self):
+        """Check all watched jobs once, returning those that finished."""
+        with self._lock:
+            unseen = set(self.pending)
+        finished = []
+        for page in range(self.max_pages):
+            if not unseen:
+                break
+            jobs = self.client.jobs.get_jobs(
+                full=True, limit=self.page_size, skip=page * self.page_size
+            )
+            for job in jobs:
+                if job.get("id") in unseen:
+                    unseen.discard(job["id"])
+                    if self.is_finished(job):
+                        finished.append(job)
+            if len(jobs) < self.page_size:
+                break
+        for job_id in unseen:
+            try:
+                job = self.client.jobs.get_job(job_id)
+            except Exception as e:
+                # e.g. a deleted job; stop watching it rather than failing
+                # every later poll
+                with self._lock:
+                    future = self.pending.pop(job_id, None)
+                if future is not None:
+                    future.set_exception(e)
+                continue
+            if self.is_finished(job):
+                finished.append(job)
+        for job in finished:
+            with self._lock:
+                future = self.pending.pop(job["id"], None)
+            if future is not None:
+                future.set_result(job)
+                if self.callback is not None:
+                    self.callback(job)
+        return finished
+
+    def is_finished(self, job):
+        """Check whether a job has reached a terminal state."""
+        return (
+            job.get("status") in self.terminal_statuses
+            or job.get("consolidated_status") in self.terminal_statuses
+        )
+
+    def as_completed(self, timeout=None):
+        """Poll until all watched jobs finish, yielding them as they do.
+
+        Raises TimeoutError if jobs are still running after `timeout`
+        seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending:
+            yield from self.poll()
+            if not self.pending:
+                return
+            delay = self.interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"{len(self.pending)} jobs still running")
+                delay = min(delay, remaining)
+            time.sleep(delay)
+
+    async def __aiter__(self):
+        while self.pending:
+            for job in await asyncio.to_thread(self.poll):
+                yield job
+            if self.pending:
+                await asyncio.sleep(self.interval)
+
+
+class JobMirror:
+    """Local SQLite mirror of a user's job history.
+
+    `sync` fetches jobs with `Jobs.iter_jobs(full=True)` and upserts them.
+    It remembers the newest job creation time seen as a high-water mark, and
+    later syncs only fetch jobs created after that mark minus `overlap`
+    seconds. The overlap also picks up changes to recently created jobs,
+    such as their final status. `query` then runs against indexed columns
+    locally, without calling the API.
+    """
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            name TEXT,
+            build TEXT,
+            status TEXT,
+            passed INTEGER,
+            owner TEXT,
+            creation_time INTEGER,
+            modification_time INTEGER,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_name ON jobs (name);
+        CREATE INDEX IF NOT EXISTS jobs_build ON jobs (build);
+        CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+        CREATE INDEX IF NOT EXISTS jobs_creation_time ON jobs (creation_time);
+        CREATE TABLE IF NOT EXISTS job_tags (
+            tag TEXT NOT NULL,
+            job_id TEXT NOT NULL,
+            PRIMARY KEY (tag, job_id)
+        );
+        CREATE TABLE IF NOT EXISTS sync_state (
+            key TEXT PRIMARY KEY,
+            value INTEGER
+        );
+    """
+
+    def __init__(self, client, path=":memory:", overlap=3600, page_size=500):
+        """Initialize class."""
+        self.client = client
+        self.overlap = overlap
+        self.page_size = page_size
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(self.schema)
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+
+    @property
+    def high_water_mark(self):
+        """Newest job creation time seen by `sync`, or None."""
+        with self._lock:
+            row = self.db.execute(
+                "SELECT value FROM sync_state WHERE key = 'high_water_mark'"
+            ).fetchone()
+        return row[0] if row else None
+
+    def sync(self, start=None):
+        """Fetch new and recently changed jobs into the mirror.
+
+        `start` limits the first sync to jobs created since that Unix time.
+        Pages are fetched without blocking `query`, and each is upserted in
+        its own transaction. The high-water mark is only moved once every
+        page is in. Returns the number of jobs fetched.
+        """
+        with self._sync_lock:
+            mark = self.high_water_mark
+            if mark is not None:
+                start = mark - self.overlap
+            jobs = iter(
+                self.client.jobs.iter_jobs(
+                    full=True, start=start, page_size=self.page_size
+                )
+            )
+            count = 0
+            while True:
+                page = list(islice(jobs, self.page_size))
+                with self._lock, self.db:
+                    for job in page:
+                        self._upsert(job)
+                        created = job.get("creation_time")
+                        if created is not None and (mark is None or created > mark):
+                            mark = created
+                    if len(page) < self.page_size and mark is not None:
+                        self.db.execute(
+                            "INSERT OR REPLACE INTO sync_state"
+                            " VALUES ('high_water_mark', ?)",
+                            (mark,),
+                        )
+                count += len(page)
+                if len(page) < self.page_size:
+                    return count
+
+    def _upsert(self, job):
+        passed = job.get("passed")
+        self.db.execute(
+            "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                job["id"],
+                job.get("name"),
+                job.get("build"),
+                job.get("status"),
+                None if passed is None else int(passed),
+                job.get("owner"),
+                job.get("creation_time"),
+                job.get("modification_time"),
+                json.dumps(job, default=Record.to_dict),
+            ),
+        )
+        self.db.execute("DELETE FROM job_tags WHERE job_id = ?", (job["id"],))
+        self.db.executemany(
+            "INSERT OR IGNORE INTO job_tags VALUES (?, ?)",
+            ((tag, job["id"]) for tag in job.get("tags") or ()),
+        )
+
+    def query(
+        self,
+        build=None,
+        tag=None,
+        status=None,
+        name=None,
+        passed=None,
+        limit=None,
+    ):
+        """Get mirrored jobs matching all the given criteria, newest first."""
+        sql = "SELECT jobs.data FROM jobs"
+        clauses = []
+        params = []
+        if tag is not None:
+            sql += " JOIN job_tags ON job_tags.job_id = jobs.id"
+            clauses.append("job_tags.tag = ?")
+            params.append(tag)
+        for column, value in (("build", build), ("status", status), ("name", name)):
+            if value is not None:
+                clauses.append(f"jobs.{column} = ?")
+                params.append(value)
+        if passed is not None:
+            clauses.append("jobs.passed = ?")
+            params.append(int(passed))
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY jobs.creation_time DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self.db.execute(sql, params).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def close(self):
+        """Close the database."""
+        self.db.close()
+
+
+StoredFile = record_type(
+    "StoredFile",
+    ["name", "size", "md5", "mtime"],
+    doc="""File listed by `Storage.get_stored_files` in model mode.""",
+)
+
+
+def stored_files(result):
+    """Convert the files of a `get_stored_files` result to `StoredFile`s."""
+    return {**result, "files": StoredFile.from_list(result.get("files") or [])}
+
+
 class Storage:
     """Temporary Storage Methods
 
     - https://wiki.saucelabs.com/display/DOCS/Temporary+Storage+Methods
+
+    With `models`, stored files are listed as `StoredFile` records.
     """
 
-    def __init__(self, client):
+    def __init__(self, client, digest_index=None, models=False):
         """Initialize class."""
         self.client = client
+        self.digest_index = digest_index
+        self.models = models
+
+    def upload_file(
+        self,
+        filepath,
+        overwrite=True,
+        filename=None,
+        length=None,
+        chunk_size=CHUNK_SIZE,
+        callback=None,
+        dedup=False,
+    ):
+        """Uploads a file to the temporary sauce storage.
+
+        `filepath` is a path, a binary file-like object or an iterable of
+        bytes. The file is streamed in `chunk_size` blocks rather than read
+        into memory. `filename` defaults to the base name of the path or file
+        object, and `length` must be given for iterables. If `callback` is
+        given, it is called as `callback(bytes_sent, total, bytes_per_second)`
+        after each block is read.
 
-    def upload_file(self, filepath, overwrite=True):
-        """Uploads a file to the temporary sauce storage."""
+        With `dedup`, a path or seekable file is hashed first, and if a file
+        with the same name and md5 is already in storage, the upload is
+        skipped and its entry from `get_stored_files` is returned instead.
+        Paths are hashed through `digest_index` when one is set. `dedup` is
+        not supported by `AsyncSauceClient`, and raises TypeError there.
+        """
+        if dedup and inspect.iscoroutinefunction(self.client.request):
+            raise TypeError("dedup is not supported by AsyncSauceClient")
         method = "POST"
-        filename = os.path.split(filepath)[1]
+        if isinstance(filepath, (str, os.PathLike)):
+            filename = filename or os.path.split(filepath)[1]
+            if dedup:
+                if self.digest_index is not None:
+                    digest = self.digest_index.digest(filepath)
+                else:
+                    digest = file_md5(filepath, chunk_size)
+                stored = self.find_stored_file(filename, digest)
+                if stored is not None:
+                    return stored
+            f = Path(filepath).open("rb")
+            try:
+                result = self.upload_file(
+                    f, overwrite, filename, length, chunk_size, callback
+                )
+            except BaseException:
+                f.close()
+                raise
+            if inspect.isawaitable(result):
+                return close_after(result, f)
+            f.close()
+            return result
+        if filename is None:
+            filename = os.path.split(getattr(filepath, "name", ""))[1]
+        if not filename:
+            raise ValueError("filename is required to upload this file")
+        if length is None:
+            position = body_position(filepath)
+            if position is None:
+                raise ValueError("length is required to upload this file")
+            length = filepath.seek(0, os.SEEK_END) - position
+            filepath.seek(position)
+        if dedup:
+            position = body_position(filepath)
+            if position is None:
+                raise ValueError("dedup requires a path or seekable file")
+            digest = file_md5(filepath, chunk_size)
+            filepath.seek(position)
+            stored = self.find_stored_file(filename, digest)
+            if stored is not None:
+                return stored
         endpoint = "/rest/v1/storage/{}/{}?overwrite={}".format(
             self.client.sauce_username, filename, "true" if overwrite else "false"
         )
-        body = Path(filepath).read_bytes()
+        body = UploadBody(filepath, length, chunk_size, callback)
         return self.client.request(
-            method, endpoint, body, content_type="application/octet-stream"
+            method,
+            endpoint,
+            body,
+            content_type="application/octet-stream",
+            headers={"Content-Length": str(length)},
         )
 
+    def upload_files(
+        self,
+        paths,
+        max_workers=4,
+        overwrite=True,
+        retries=2,
+        backoff=1.0,
+        dedup=False,
+    ):
+        """Upload many files to the temporary sauce storage concurrently.
+
+        Files are uploaded on at most `max_workers` threads. An upload that
+        fails with a transient error (429, 5xx or a connection error) is
+        retried up to `retries` times, waiting `backoff` seconds and doubling
+        the wait after each attempt. Returns a list of `UploadResult` in the
+        order of `paths`; a failed upload has its exception in `error`. With
+        `AsyncSauceClient`, at most `max_workers` uploads are awaited at once,
+        and `dedup` raises TypeError.
+        """
+        if dedup and inspect.iscoroutinefunction(self.client.request):
+            raise TypeError("dedup is not supported by AsyncSauceClient")
+
+        def upload(path):
+            sent = 0
+
+            def progress(bytes_sent, total, rate):
+                nonlocal sent
+                sent = bytes_sent
+
+            started = time.monotonic()
+            for attempt in range(retries + 1):
+                sent = 0
+                try:
+                    response = self.upload_file(
+                        path, overwrite=overwrite, callback=progress, dedup=dedup
+                    )
+                except Exception as e:
+                    if attempt < retries and is_transient_error(e):
+                        time.sleep(backoff * 2**attempt)
+                        continue
+                    elapsed = time.monotonic() - started
+                    return UploadResult(path, None, sent, elapsed, None, e)
+                elapsed = time.monotonic() - started
+                return UploadResult(
+                    path, response, sent, elapsed, response.get("md5"), None
+                )
+
+        async def upload_async(path, semaphore):
+            sent = 0
+
+            def progress(bytes_sent, total, rate):
+                nonlocal sent
+                sent = bytes_sent
+
+            async with semaphore:
+                started = time.monotonic()
+                for attempt in range(retries + 1):
+                    sent = 0
+                    try:
+                        response = await self.upload_file(
+                            path, overwrite=overwrite, callback=progress, dedup=dedup
+                        )
+                    except Exception as e:
+                        if attempt < retries and is_transient_error(e):
+                            await asyncio.sleep(backoff * 2**attempt)
+                            continue
+                        elapsed = time.monotonic() - started
+                        return UploadResult(path, None, sent, elapsed, None, e)
+                    elapsed = time.monotonic() - started
+                    return UploadResult(
+                        path, response, sent, elapsed, response.get("md5"), None
+                    )
+
+        async def upload_all():
+            semaphore = asyncio.Semaphore(max_workers)
+            uploads = (upload_async(path, semaphore) for path in paths)
+            return list(await asyncio.gather(*uploads))
+
+        if inspect.iscoroutinefunction(self.client.request):
+            return upload_all()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(upload, paths))
+
     def get_stored_files(self):
         """Check which files are in your temporary storage."""
         method = "GET"
         endpoint = f"/rest/v1/storage/{self.client.sauce_username}"
-        return self.client.request(method, endpoint)
+        result = self.client.request(method, endpoint)
+        return map_result(result, stored_files) if self.models else result
+
+    def find_stored_file(self, filename, md5_digest):
+        """Get the stored file entry matching a name and md5 digest, if any."""
+        for stored in self.get_stored_files().get("files", []):
+            if stored.get("name") == filename and stored.get("md5") == md5_digest:
+                return stored
+        return None
+
+
+Tunnel = record_type(
+    "Tunnel",
+    [
+        "id",
+        "owner",
+        "status",
+        "host",
+        "ip_address",
+        "tunnel_identifier",
+        "creation_time",
+        "launch_time",
+        "shutdown_time",
+        "user_shutdown",
+        "is_ready",
+        "shared_tunnel",
+        "domain_names",
+        "direct_domains",
+        "no_ssl_bump_domains",
+        "no_proxy_caching",
+        "use_kgp",
+        "use_caching_proxy",
+        "vm_version",
+        "metadata",
+        "extra_info",
+    ],
+    lazy=["metadata", "extra_info"],
+    shared=["owner", "status", "host", "vm_version"],
+    doc="""Tunnel returned by `Tunnels.get_tunnel` in model mode.""",
+)
 
 
 class Tunnels:
     """Tunnel Methods
 
     - https://wiki.saucelabs.com/display/DOCS/Tunnel+Methods
+
+    With `models`, tunnels are returned as `Tunnel` records.
     """
 
-    def __init__(self, client):
+    def __init__(self, client, models=False):
         """Initialize class."""
         self.client = client
+        self.models = models
 
     def get_tunnels(self):
         """Retrieves all running tunnels for a specific user."""
@@ -612,10 +4050,112 @@ class Tunnels:
         """Get information for a tunnel given its ID."""
         method = "GET"
         endpoint = f"/rest/v1/{self.client.sauce_username}/tunnels/{tunnel_id}"
-        return self.client.request(method, endpoint)
+        result = self.client.request(method, endpoint)
+        return map_result(result, Tunnel) if self.models else result
 
     def delete_tunnel(self, tunnel_id):
         """Get information for a tunnel given its ID."""
         method = "DELETE"
         endpoint = f"/rest/v1/{self.client.sauce_username}/tunnels/{tunnel_id}"
         return self.client.request(method, endpoint)
+
+
+class TunnelFleet:
+    """Concurrent view of all of a user's Sauce Connect tunnels.
+
+    `get_tunnels` fetches the details of every running tunnel with
+    concurrent `Tunnels.get_tunnel` calls on up to `max_workers` threads,
+    and caches them for `ttl` seconds. Tunnels that disappear between
+    listing and inspection are left out.
+    """
+
+    def __init__(self, client, max_workers=16, ttl=10.0):
+        """Initialize class."""
+        self.client = client
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self._tunnels = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    def get_tunnels(self, refresh=False):
+        """Get the details of all running tunnels.
+
+        Tunnels not found (404) are skipped; any other failure to inspect a
+        tunnel is raised once the whole fleet has been fetched.
+        """
+        with self._lock:
+            if not refresh and self._tunnels is not None:
+                if time.monotonic() < self._expires:
+                    return self._tunnels
+            calls = ((tunnel_id, {}) for tunnel_id in self.client.tunnels.get_tunnels())
+            results, errors = run_batch(
+                self.client.tunnels.get_tunnel, calls, self.max_workers
+            )
+            for error in errors.values():
+                response = getattr(error, "response", None)
+                if getattr(response, "status", None) != 404:
+                    raise error
+            self._tunnels = list(results.values())
+            self._expires = time.monotonic() + self.ttl
+            return self._tunnels
+
+    def invalidate(self):
+        """Drop the cached tunnel details."""
+        with self._lock:
+            self._tunnels = None
+
+    def find(
+        self,
+        tunnel_identifier=None,
+        owner=None,
+        status=None,
+        min_age=None,
+        max_age=None,
+        refresh=False,
+    ):
+        """Find tunnels matching all the given criteria.
+
+        Ages are in seconds since the tunnel's creation time.
+        """
+        now = time.time()
+        matches = []
+        for tunnel in self.get_tunnels(refresh):
+            if tunnel_identifier is not None:
+                if tunnel.get("tunnel_identifier") != tunnel_identifier:
+                    continue
+            if owner is not None and tunnel.get("owner") != owner:
+                continue
+            if status is not None and tunnel.get("status") != status:
+                continue
+            if min_age is not None or max_age is not None:
+                created = tunnel.get("creation_time")
+                if created is None:
+                    continue
+                age = now - created
+                if min_age is not None and age < min_age:
+                    continue
+                if max_age is not None and age > max_age:
+                    continue
+            matches.append(tunnel)
+        return matches
+
+    def delete_tunnels(self, tunnel_ids):
+        """Delete tunnels concurrently.
+
+        Returns `(results, errors)` dicts keyed by tunnel ID.
+        """
+        calls = ((tunnel_id, {}) for tunnel_id in tunnel_ids)
+        try:
+            return run_batch(self.client.tunnels.delete_tunnel, calls, self.max_workers)
+        finally:
+            self.invalidate()
+
+    def delete_stale(self, max_age, **criteria):
+        """Delete tunnels older than `max_age` seconds that match the other
+        `find` criteria.
+
+        Returns `(results, errors)` dicts keyed by tunnel ID.
+        """
+        stale = self.find(min_age=max_age, refresh=True, **criteria)
+        return self.delete_tunnels(tunnel["id"] for tunnel in stale)
@@ -1,8 +1,19 @@
 #!/usr/bin/env python3
 
+import asyncio
+import gzip
+import http.client
+import io
+import json
+import os
+import tempfile
+import time
 import unittest
-from unittest.mock import patch
+import zlib
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import benchmark_sauceclient
 import sauceclient
 
 
@@ -17,6 +28,184 @@ class TestSauce(unittest.TestCase):
 
         self.assertRaises(sauceclient.SauceException, self.sc.information.get_status)
 
+    @patch("sauceclient.http_client.HTTPSConnection.request")
+    def test_connection_reused(self, _, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = b"{}"
+        mocked.return_value.will_close = False
+
+        self.sc.information.get_status()
+        connection, reused = self.sc.pool.get()
+        self.assertTrue(reused)
+        self.sc.pool.put(connection)
+
+        self.sc.information.get_status()
+        self.assertEqual(len(self.sc.pool._idle), 1)
+
+    @patch("sauceclient.http_client.HTTPSConnection.request")
+    def test_stale_connection_reconnects(self, _, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = b"{}"
+        mocked.return_value.will_close = False
+
+        self.sc.information.get_status()
+        mocked.side_effect = [
+            http.client.RemoteDisconnected("closed"),
+            mocked.return_value,
+        ]
+        resp = self.sc.information.get_status()
+        self.assertIsInstance(resp, dict)
+        self.assertEqual(mocked.call_count, 3)
+
+    def test_retry_server_error(self, mocked):
+        self.sc.retry = sauceclient.RetryPolicy(backoff_factor=0)
+        failed = MagicMock(status=503, reason="Unavailable")
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = b"{}"
+        mocked.side_effect = [failed, failed, mocked.return_value]
+
+        resp = self.sc.jobs.get_job("job-id")
+        self.assertIsInstance(resp, dict)
+        self.assertEqual(mocked.call_count, 3)
+
+    def test_retry_skips_post(self, mocked):
+        self.sc.retry = sauceclient.RetryPolicy(backoff_factor=0)
+        mocked.return_value.status = 503
+        mocked.return_value.reason = "Unavailable"
+
+        with self.assertRaises(sauceclient.SauceException):
+            self.sc.javascript.js_tests_status(["test-1"])
+        self.assertEqual(mocked.call_count, 1)
+
+    def test_retry_gives_up(self, mocked):
+        self.sc.retry = sauceclient.RetryPolicy(total=2, backoff_factor=0)
+        mocked.return_value.status = 429
+        mocked.return_value.reason = "Too Many Requests"
+
+        with self.assertRaises(sauceclient.SauceException):
+            self.sc.jobs.get_job("job-id")
+        self.assertEqual(mocked.call_count, 3)
+
+    def test_retry_after(self, mocked):
+        policy = sauceclient.RetryPolicy(max_backoff=10)
+        response = MagicMock()
+        response.getheader.return_value = "2"
+        self.assertEqual(policy.get_backoff(0, response), 2)
+        response.getheader.return_value = "120"
+        self.assertEqual(policy.get_backoff(0, response), 10)
+        self.assertLessEqual(policy.get_backoff(3), 4)
+
+    def test_rate_limiter(self, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = b"{}"
+        self.sc.rate_limiter = sauceclient.TokenBucket(rate=10, capacity=1)
+
+        with patch("sauceclient.time.sleep") as sleep:
+            self.sc.information.get_status()
+            sleep.assert_not_called()
+            self.sc.information.get_status()
+            delay = sleep.call_args[0][0]
+        self.assertGreater(delay, 0)
+        self.assertLessEqual(delay, 0.1)
+
+    @patch("sauceclient.http_client.HTTPSConnection.request")
+    @patch("sauceclient.http_client.HTTPSConnection.connect")
+    def test_request_hooks(self, _, __, mocked):
+        self.sc.retry = sauceclient.RetryPolicy(backoff_factor=0)
+        failed = MagicMock(status=503, reason="Unavailable")
+        failed.read.return_value = b""
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = b'{"passed": true}'
+        mocked.side_effect = [failed, mocked.return_value]
+        events = []
+        self.sc.hooks.append(events.append)
+
+        self.sc.jobs.update_job("0123456789abcdef0123456789abcdef", passed=True)
+        (event,) = events
+        self.assertEqual(event.method, "PUT")
+        self.assertEqual(event.endpoint, "/rest/v1/{username}/jobs/{id}")
+        self.assertEqual(event.status, 200)
+        self.assertEqual(event.attempts, 2)
+        self.assertEqual(event.bytes_sent, len(b'{"passed": true}'))
+        self.assertEqual(event.bytes_received, len(b'{"passed": true}'))
+        self.assertIsNone(event.error)
+        self.assertLessEqual(
+            {"connect", "send", "wait", "read", "decode"}, set(event.phases)
+        )
+
+        mocked.side_effect = None
+        mocked.return_value.status = 404
+        with self.assertRaises(sauceclient.SauceException):
+            self.sc.jobs.get_job("job-id")
+        self.assertIsInstance(events[1].error, sauceclient.SauceException)
+
+    def test_request_metrics(self, mocked):
+        metrics = sauceclient.RequestMetrics()
+        for duration, error in ((0.02, None), (0.3, None), (20, OSError())):
+            event = sauceclient.RequestEvent("GET", "/rest/v1/info/status", "/s")
+            event.attempts = 1
+            event.bytes_received = 10
+            event.duration = duration
+            event.error = error
+            event.phases = {"wait": duration}
+            metrics(event)
+
+        (stats,) = metrics.snapshot()["endpoints"]
+        self.assertEqual(stats["count"], 3)
+        self.assertEqual(stats["errors"], 1)
+        self.assertEqual(stats["bytes_received"], 30)
+        self.assertEqual(stats["duration_buckets"]["0.025"], 1)
+        self.assertEqual(stats["duration_buckets"]["10.0"], 2)
+        self.assertEqual(
+            json.loads(json.dumps(metrics.snapshot()))["endpoints"][0], stats
+        )
+        text = metrics.to_prometheus()
+        self.assertIn(
+            'sauceclient_request_duration_seconds_bucket{method="GET",endpoint="/s",'
+            'le="+Inf"} 3\n',
+            text,
+        )
+        self.assertIn(
+            'sauceclient_request_errors_total{method="GET",endpoint="/s"} 1\n', text
+        )
+        self.assertIn("# TYPE sauceclient_request_phase_seconds_total counter", text)
+
+    @patch("sauceclient.http_client.HTTPSConnection.request")
+    def test_compression(self, request, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = gzip.compress(b'{"passed": true}')
+        mocked.return_value.getheader.side_effect = lambda name, default=None: (
+            "gzip" if name == "Content-Encoding" else default
+        )
+        self.sc.compress_min_size = 10
+
+        resp = self.sc.jobs.update_job("job-id", passed=True)
+        self.assertEqual(resp, {"passed": True})
+        body, headers = request.call_args[0][2], request.call_args[1]["headers"]
+        self.assertEqual(headers["Accept-Encoding"], "gzip, deflate")
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(body), b'{"passed": true}')
+
+        data = b"[1, 2, 3]" * 100
+        raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        for encoding, compressed in (
+            ("deflate", zlib.compress(data)),
+            ("deflate", raw.compress(data) + raw.flush()),
+            ("gzip", gzip.compress(data)),
+        ):
+            # a 1-byte first chunk can't tell raw deflate from zlib yet
+            chunks = [compressed[:1]]
+            chunks += [compressed[i : i + 7] for i in range(1, len(compressed), 7)]
+            self.assertEqual(
+                b"".join(sauceclient.iter_decompressed(chunks, encoding)), data
+            )
+
     def test_account_get_user(self, mocked):
         mocked.return_value.status = 200
         mocked.return_value.reason = "OK"
@@ -75,6 +264,20 @@ class TestSauce(unittest.TestCase):
         resp = self.sc.account.change_access_key()
         self.assertIsInstance(resp, dict)
 
+    def test_account_change_access_key_updates_client(self, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = b'{"access_key": "new-key"}'
+        old = self.sc.get_header_template("application/json")
+        with self.assertRaises(TypeError):
+            old["Authorization"] = "changed"
+
+        self.sc.account.change_access_key()
+        self.assertEqual(self.sc.sauce_access_key, "new-key")
+        new = self.sc.get_header_template("application/json")
+        self.assertNotEqual(new["Authorization"], old["Authorization"])
+        self.assertIs(self.sc.get_header_template("application/json"), new)
+
     def test_account_get_activity(self, mocked):
         mocked.return_value.status = 200
         mocked.return_value.reason = "OK"
@@ -94,6 +297,60 @@ class TestSauce(unittest.TestCase):
         resp = self.sc.account.get_usage(start="1976-10-23", end="1976-10-23")
         self.assertIsInstance(resp, dict)
 
+    def test_account_admission_controller(self, mocked):
+        concurrency = {
+            "concurrency": {
+                "ancestor": {"allowed": {"overall": 100}, "current": {"overall": 50}},
+                "self": {"allowed": {"overall": 2}, "current": {"overall": 0}},
+            }
+        }
+        controller = sauceclient.AdmissionController(self.sc, poll_interval=0.01)
+        with patch.object(self.sc.account, "get_concurrency", return_value=concurrency):
+            self.assertEqual(controller.reconcile(), 2)
+            with controller.session():
+                slot = controller.acquire(timeout=1)
+                with self.assertRaises(TimeoutError):
+                    controller.acquire(timeout=0.05)
+                controller.release(slot)
+                self.assertIsNotNone(controller.try_acquire())
+
+            # a session started elsewhere takes up a slot
+            concurrency["concurrency"]["self"]["current"]["overall"] = 2
+            self.assertEqual(controller.reconcile(), 1)
+
+    def test_account_admission_controller_directory(self, mocked):
+        concurrency = {"concurrency": {"self": {"remaining": {"overall": 2}}}}
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            patch.object(self.sc.account, "get_concurrency", return_value=concurrency),
+        ):
+            first = sauceclient.AdmissionController(self.sc, directory=tmp)
+            second = sauceclient.AdmissionController(self.sc, directory=tmp)
+            slots = [first.acquire(timeout=1), second.acquire(timeout=1)]
+            self.assertIsNone(first.try_acquire())
+            self.assertIsNone(second.try_acquire())
+            second.release(slots.pop())
+            self.assertIsNotNone(first.try_acquire())
+
+    def test_account_admission_controller_directory_shrink(self, mocked):
+        limits = {"allowed": {"overall": 10}, "current": {"overall": 0}}
+        concurrency = {"concurrency": {"self": limits}}
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            patch.object(self.sc.account, "get_concurrency", return_value=concurrency),
+        ):
+            controller = sauceclient.AdmissionController(self.sc, directory=tmp)
+            slots = [controller.acquire(timeout=1) for _ in range(10)]
+            for slot in slots[:7]:
+                controller.release(slot)
+            # slots 7-9 are still held, and 2 sessions started elsewhere
+            limits["current"]["overall"] = 5
+            self.assertEqual(controller.reconcile(), 8)
+            taken = []
+            while (slot := controller.try_acquire()) is not None:
+                taken.append(slot)
+            self.assertEqual(len(taken), 5)
+
     """ANALYTICS"""
 
     def test_analytics_get_test_trends(self, mocked):
@@ -109,6 +366,76 @@ class TestSauce(unittest.TestCase):
         resp = self.sc.analytics.get_test_trends(time_range="6d", interval="6h")
         self.assertIsInstance(resp, dict)
 
+    def test_analytics_get_test_trends_frame(self, mocked):
+        payload = {
+            "meta": {"status": 200},
+            "buckets": [
+                {"timestamp": 1, "count": 4, "aggs": {"status": {"failed": 1}}},
+                {"timestamp": 2, "count": 0, "aggs": {"status": {"failed": 0}}},
+                {"timestamp": 3, "count": 2, "aggs": {"status": {}}},
+            ],
+        }
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = json.dumps(payload).encode()
+
+        frame = self.sc.analytics.get_test_trends(time_range="6d", frame=True)
+        self.assertEqual(len(frame), 3)
+        self.assertEqual(list(frame["timestamp"]), [1, 2, 3])
+        rates = frame.ratio("aggs.status.failed", "count")
+        self.assertEqual(rates[0], 0.25)
+        self.assertNotEqual(rates[1], rates[1])
+
+    def test_analytics_frame_group_sum(self, mocked):
+        frame = sauceclient.ColumnFrame.from_payload(
+            {
+                "builds": {
+                    "items": [
+                        {"browser": "chrome", "failed": 1, "total": 4},
+                        {"browser": "firefox", "failed": 2, "total": 3},
+                        {"browser": "chrome", "failed": None, "total": 2},
+                    ]
+                }
+            }
+        )
+        self.assertEqual(
+            frame.group_sum("browser", "failed"), {"chrome": 1, "firefox": 2}
+        )
+        self.assertEqual(
+            frame.group_sum("browser", "total"), {"chrome": 6, "firefox": 3}
+        )
+
+        frame = sauceclient.ColumnFrame.from_payload(
+            {"concurrency": {"timestamps": [1, 2], "max": [3, 4]}}
+        )
+        self.assertEqual(list(frame["max"]), [3, 4])
+
+    @unittest.skipIf(
+        sauceclient.import_optional("numpy") is None, "numpy is not installed"
+    )
+    def test_analytics_frame_numpy(self, mocked):
+        frame = sauceclient.ColumnFrame.from_records(
+            [
+                {"browser": "chrome", "failed": 1, "total": 4},
+                {"browser": "firefox", "failed": 2, "total": 0},
+                {"browser": "chrome", "failed": None, "total": 2},
+                {"browser": "safari", "failed": 3, "total": None},
+            ]
+        )
+        results = []
+        for numpy in (sauceclient.import_optional("numpy"), None):
+            with patch("sauceclient.import_optional", return_value=numpy):
+                ratio = frame.ratio("failed", "total")
+                results.append(
+                    (
+                        [r if r == r else None for r in ratio],
+                        frame.group_sum("browser", "failed"),
+                    )
+                )
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0][0], [0.25, None, None, None])
+        self.assertEqual(results[0][1], {"chrome": 1, "firefox": 2, "safari": 3})
+
     def test_analytics_get_error_trends(self, mocked):
         mocked.return_value.status = 200
         mocked.return_value.reason = "OK"
@@ -148,6 +475,93 @@ class TestSauce(unittest.TestCase):
         resp = self.sc.analytics.get_tests(time_range="6d", size=50)
         self.assertIsInstance(resp, dict)
 
+    def test_analytics_get_tests_stream(self, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.side_effect = [
+            b'{"items": [{"id": "test-1"}, {"id": "te',
+            b'st-2"}], "has_more": false}',
+            b"",
+        ]
+
+        tests = self.sc.analytics.get_tests(time_range="1d", stream=True)
+        self.assertEqual(next(tests), {"id": "test-1"})
+        self.assertEqual(next(tests), {"id": "test-2"})
+        with self.assertRaises(StopIteration) as cm:
+            next(tests)
+        self.assertEqual(cm.exception.value, {"has_more": False})
+
+    def test_analytics_iter_tests(self, mocked):
+        tests = [
+            {"id": f"test-{hour}", "creation_time": f"1976-10-12T{hour:02}:30:00Z"}
+            for hour in range(24)
+        ]
+
+        def get_tests(start, end, size, skip, **filters):
+            self.assertEqual(filters, {"owner": "someone"})
+            # overlap with the previous window, so some tests show up twice
+            start = sauceclient.parse_timestamp(start) - timedelta(hours=1)
+            start = sauceclient.format_timestamp(start)
+            items = [t for t in tests if start <= t["creation_time"] <= end]
+            return {
+                "items": items[skip : skip + size],
+                "has_more": skip + size < len(items),
+            }
+
+        with patch.object(self.sc.analytics, "get_tests", side_effect=get_tests):
+            resp = list(
+                self.sc.analytics.iter_tests(
+                    "1976-10-12T00:00:00Z",
+                    "1976-10-13T00:00:00Z",
+                    shards=6,
+                    max_workers=2,
+                    size=2,
+                    owner="someone",
+                )
+            )
+        self.assertEqual(resp, tests)
+
+        # pages are yielded as they arrive, and only `prefetch` are buffered
+        with patch.object(
+            self.sc.analytics, "get_tests", side_effect=get_tests
+        ) as fetched:
+            items = self.sc.analytics.iter_tests(
+                "1976-10-12T00:00:00Z",
+                "1976-10-13T00:00:00Z",
+                shards=1,
+                size=1,
+                prefetch=2,
+                owner="someone",
+            )
+            self.assertEqual(next(items), tests[0])
+            time.sleep(0.2)
+            self.assertLessEqual(fetched.call_count, 4)
+            items.close()
+
+    def test_analytics_query_spec(self, mocked):
+        spec = sauceclient.QuerySpec(
+            "/rest/v1/analytics/tests",
+            ["start", "owner", "skip", "pretty"],
+            flags=["pretty"],
+            aliases={"skip": "from"},
+        )
+        start = datetime(1976, 10, 12, 12, tzinfo=timezone.utc)
+
+        endpoint = spec.encode({"start": start, "skip": 50, "pretty": True, "x": 1})
+        self.assertEqual(
+            endpoint,
+            "/rest/v1/analytics/tests?start=1976-10-12T12%3A00%3A00Z&from=50&pretty=",
+        )
+        self.assertEqual(spec.encode({"owner": None, "skip": 0}), spec.path + "?")
+        spec.encode({"start": start, "skip": 50, "pretty": True})
+        self.assertEqual(spec._encode.cache_info().hits, 1)
+        for skip in (1, 1.0, True):
+            self.assertEqual(spec.encode({"skip": skip}), f"{spec.path}?from={skip}")
+        with self.assertRaises(TypeError):
+            spec.encode({"owner": object()})
+        with self.assertRaises(TypeError):
+            spec.encode({"owner": ["a", "b"]})
+
     def test_analytics_get_concurrency(self, mocked):
         mocked.return_value.status = 200
         mocked.return_value.reason = "OK"
@@ -185,6 +599,104 @@ class TestSauce(unittest.TestCase):
         resp = self.sc.information.get_platforms("appium")
         self.assertIsInstance(resp, list)
 
+    def test_information_cache(self, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = b"[]"
+        self.sc.cache = sauceclient.ResponseCache()
+
+        resp = self.sc.information.get_platforms()
+        self.assertIs(self.sc.information.get_platforms(), resp)
+        self.assertEqual(mocked.call_count, 1)
+
+        self.sc.account.get_siblings()
+        self.sc.account.get_siblings()
+        self.assertEqual(mocked.call_count, 3)
+
+    @patch("sauceclient.http_client.HTTPSConnection.request")
+    def test_information_cache_revalidate(self, request, mocked):
+        url = "/rest/v1/info/platforms/all"
+        self.sc.cache = sauceclient.ResponseCache()
+        self.sc.cache._store(url, sauceclient.CacheEntry(0, '"v1"', None, ["cached"]))
+        mocked.return_value.status = 304
+        mocked.return_value.reason = "Not Modified"
+        mocked.return_value.read.return_value = b""
+
+        resp = self.sc.information.get_platforms()
+        self.assertEqual(resp, ["cached"])
+        self.assertEqual(request.call_args[1]["headers"]["If-None-Match"], '"v1"')
+        self.assertGreater(self.sc.cache.get(url).expires, 0)
+
+    def test_information_cache_directory(self, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = b'{"status": "ok"}'
+
+        with tempfile.TemporaryDirectory() as tmp:
+            self.sc.cache = sauceclient.ResponseCache(directory=tmp)
+            self.sc.information.get_status()
+            self.sc.cache = sauceclient.ResponseCache(directory=tmp)
+            resp = self.sc.information.get_status()
+        self.assertEqual(resp, {"status": "ok"})
+        self.assertEqual(mocked.call_count, 1)
+
+    def test_information_get_platform_catalog(self, mocked):
+        platforms = [
+            {"api_name": "chrome", "os": "Windows 11", "short_version": "119"},
+            {"api_name": "chrome", "os": "Windows 11", "short_version": "121"},
+            {"api_name": "chrome", "os": "Windows 11", "short_version": "120"},
+            {"api_name": "chrome", "os": "Windows 11", "short_version": "beta"},
+            {"api_name": "chrome", "os": "Mac 13", "short_version": "122"},
+            {"api_name": "chrome", "os": "Mac 13", "short_version": "121"},
+            {
+                "api_name": "iphone",
+                "os": "Mac 13",
+                "short_version": "15.5",
+                "device": "iphone",
+                "automation_backend": "appium",
+                "supported_backend_versions": ["1.22.3", "2.0.0"],
+            },
+            {
+                "api_name": "iphone",
+                "os": "Mac 13",
+                "short_version": "16.2",
+                "device": "iphone",
+                "automation_backend": "appium",
+                "supported_backend_versions": ["2.0.0"],
+            },
+            {
+                "api_name": "iphone",
+                "os": "Mac 11",
+                "short_version": "14.0",
+                "device": "iphone",
+                "automation_backend": "appium",
+                "supported_backend_versions": ["1.5.3"],
+            },
+        ]
+        eol_dates = {"1.5.3": 1493884800, "2.0.0": None}
+
+        def request(method, endpoint):
+            return eol_dates if endpoint.endswith("/eol") else platforms
+
+        with patch.object(self.sc, "request", side_effect=request):
+            catalog = self.sc.information.get_platform_catalog()
+        self.assertEqual(len(catalog), 8)
+
+        latest = catalog.latest("chrome", os="Windows 11", count=3)
+        self.assertEqual([p.short_version for p in latest], ["121", "120", "119"])
+        latest = catalog.latest("chrome", count=3)
+        self.assertEqual([p.short_version for p in latest], ["122", "121", "120"])
+        self.assertEqual(len(catalog.find(api_name="chrome", os="Windows 11")), 4)
+        ios = catalog.find(api_name="iphone", min_version="15.5")
+        self.assertEqual([p.short_version for p in ios], ["15.5", "16.2"])
+        ios = catalog.find(device="iphone", min_version="16")
+        self.assertEqual([p.short_version for p in ios], ["16.2"])
+        mac = catalog.find(api_name="chrome", os="Mac 13", max_version="122")
+        self.assertEqual([p.short_version for p in mac], ["121", "122"])
+        self.assertEqual(catalog.find(api_name="firefox"), [])
+        with self.assertRaises(ValueError):
+            catalog.find(api_name="chrome", min_version="dev")
+
     def test_information_get_appium_eol_dates(self, mocked):
         mocked.return_value.status = 200
         mocked.return_value.reason = "OK"
@@ -211,6 +723,28 @@ class TestSauce(unittest.TestCase):
         resp = self.sc.javascript.js_tests_status(["test-1", "test-2"])
         self.assertIsInstance(resp, dict)
 
+    def test_javascript_test_runner(self, mocked):
+        statuses = [
+            {"js tests": [{"id": "t1", "result": None}, {"id": "t2", "result": None}]},
+            {"js tests": [{"id": "t1", "result": None}, {"id": "t2", "result": {}}]},
+            {"js tests": [{"id": "t1", "result": {"passed": 1}}]},
+        ]
+        runner = sauceclient.JavaScriptTestRunner(self.sc, min_interval=0.01)
+        with (
+            patch.object(
+                self.sc.javascript, "js_tests", return_value={"js tests": ["t1", "t2"]}
+            ),
+            patch.object(
+                self.sc.javascript, "js_tests_status", side_effect=statuses
+            ) as js_tests_status,
+        ):
+            futures = runner.submit(["OS X 10.11", "chrome", ""], "url", "jasmine")
+            resp = [entry["id"] for entry in runner.as_completed(timeout=5)]
+        self.assertEqual(resp, ["t2", "t1"])
+        self.assertEqual(futures[0].result(), {"id": "t1", "result": {"passed": 1}})
+        self.assertEqual(js_tests_status.call_args_list[-1][0][0], ["t1"])
+        self.assertEqual(runner.interval, 0.01)
+
     def test_jobs_get_jobs(self, mocked):
         mocked.return_value.status = 200
         mocked.return_value.reason = "OK"
@@ -230,6 +764,145 @@ class TestSauce(unittest.TestCase):
         )
         self.assertIsInstance(resp, list)
 
+    def test_jobs_get_jobs_stream(self, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.will_close = False
+        mocked.return_value.read.side_effect = [b'[{"id": 1', b"2}, 3.", b"5]", b""]
+
+        jobs = self.sc.jobs.get_jobs(full=True, stream=True)
+        self.assertEqual(list(jobs), [{"id": 12}, 3.5])
+        self.assertEqual(len(self.sc.pool._idle), 1)
+
+        with self.assertRaises(ValueError):
+            list(sauceclient.iter_json_array([b"[1 2]"]))
+
+    @patch("sauceclient.http_client.HTTPSConnection.request")
+    @patch("sauceclient.http_client.HTTPSConnection.connect")
+    def test_jobs_get_jobs_stream_retry(self, _, __, mocked):
+        self.sc.retry = sauceclient.RetryPolicy(backoff_factor=0)
+        events = []
+        self.sc.hooks.append(events.append)
+        failed = MagicMock(status=503, reason="Unavailable")
+        failed.getheader.return_value = None
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.side_effect = [b'[{"id": 1}]', b""]
+        mocked.side_effect = [failed, mocked.return_value]
+
+        jobs = self.sc.jobs.get_jobs(stream=True)
+        self.assertEqual(list(jobs), [{"id": 1}])
+        self.assertEqual(mocked.call_count, 2)
+        (event,) = events
+        self.assertEqual(event.endpoint, "/rest/v1/{username}/jobs")
+        self.assertEqual((event.status, event.attempts), (200, 2))
+        self.assertEqual(event.bytes_received, 11)
+        self.assertIn("read", event.phases)
+
+    def test_jobs_iter_jobs(self, mocked):
+        jobs = [{"id": f"job-{i}"} for i in range(7)]
+
+        def get_jobs(limit, skip, **kwargs):
+            return jobs[skip : skip + limit]
+
+        with patch.object(self.sc.jobs, "get_jobs", side_effect=get_jobs):
+            resp = list(self.sc.jobs.iter_jobs(full=True, page_size=3, prefetch=2))
+        self.assertEqual(resp, jobs)
+
+        with patch.object(self.sc.jobs, "get_jobs", side_effect=get_jobs):
+            resp = list(self.sc.jobs.iter_jobs(page_size=7, prefetch=0))
+        self.assertEqual(resp, jobs)
+
+    def test_jobs_job_watcher(self, mocked):
+        pages = [
+            [{"id": "job-1", "status": "in progress"}, {"id": "job-9"}],
+            [{"id": "job-1", "status": "complete"}, {"id": "job-9"}],
+        ]
+        finished = []
+        watcher = sauceclient.JobWatcher(
+            self.sc, ["job-1", "job-2"], interval=0.01, callback=finished.append
+        )
+        future = watcher.add("job-1")
+        with (
+            patch.object(self.sc.jobs, "get_jobs", side_effect=pages) as get_jobs,
+            patch.object(
+                self.sc.jobs,
+                "get_job",
+                side_effect=[{"id": "job-2"}, {"id": "job-2", "status": "error"}],
+            ) as get_job,
+        ):
+            resp = [job["id"] for job in watcher.as_completed(timeout=5)]
+        self.assertEqual(resp, ["job-1", "job-2"])
+        self.assertEqual(future.result()["status"], "complete")
+        self.assertEqual(len(finished), 2)
+        self.assertEqual(get_jobs.call_count, 2)
+        self.assertEqual(get_job.call_count, 2)
+
+    def test_jobs_job_watcher_errors(self, mocked):
+        watcher = sauceclient.JobWatcher(self.sc, interval=0.01)
+        done = watcher.add("job-1")
+        missing = watcher.add("job-2")
+        error = sauceclient.SauceException("404: Not Found")
+        with (
+            patch.object(
+                self.sc.jobs,
+                "get_jobs",
+                return_value=[{"id": "job-1", "status": "complete"}],
+            ),
+            patch.object(self.sc.jobs, "get_job", side_effect=error),
+        ):
+            resp = [job["id"] for job in watcher.as_completed(timeout=5)]
+        self.assertEqual(resp, ["job-1"])
+        self.assertEqual(done.result()["status"], "complete")
+        self.assertIs(missing.exception(), error)
+        self.assertEqual(watcher.pending, {})
+
+    def test_jobs_job_mirror(self, mocked):
+        jobs = [
+            {
+                "id": "job-1",
+                "build": "b1",
+                "status": "complete",
+                "passed": True,
+                "tags": ["smoke"],
+                "creation_time": 1000,
+            },
+            {
+                "id": "job-2",
+                "build": "b2",
+                "status": "in progress",
+                "passed": None,
+                "tags": [],
+                "creation_time": 5000,
+            },
+        ]
+        mirror = sauceclient.JobMirror(self.sc, overlap=100)
+        with patch.object(self.sc.jobs, "iter_jobs", return_value=jobs) as iter_jobs:
+            self.assertEqual(mirror.sync(), 2)
+            self.assertEqual(mirror.high_water_mark, 5000)
+            jobs[1] = {**jobs[1], "status": "complete", "passed": False}
+            mirror.sync()
+        self.assertEqual(iter_jobs.call_args[1]["start"], 4900)
+        self.assertEqual([job["id"] for job in mirror.query(tag="smoke")], ["job-1"])
+        self.assertEqual(mirror.query(build="b2")[0]["status"], "complete")
+        self.assertEqual(len(mirror.query(status="complete")), 2)
+        self.assertEqual(mirror.query(passed=False)[0]["id"], "job-2")
+        mirror.close()
+
+    def test_jobs_job_mirror_query_during_sync(self, mocked):
+        mirror = sauceclient.JobMirror(self.sc, page_size=1)
+
+        def iter_jobs(**kwargs):
+            for i in range(3):
+                # the previous page is queryable while the next is fetched
+                self.assertEqual(len(mirror.query()), i)
+                yield {"id": f"job-{i}", "creation_time": i}
+
+        with patch.object(self.sc.jobs, "iter_jobs", side_effect=iter_jobs):
+            self.assertEqual(mirror.sync(), 3)
+        self.assertEqual(mirror.high_water_mark, 2)
+        mirror.close()
+
     def test_jobs_get_job(self, mocked):
         mocked.return_value.status = 200
         mocked.return_value.reason = "OK"
@@ -238,6 +911,33 @@ class TestSauce(unittest.TestCase):
         resp = self.sc.jobs.get_job("job-id")
         self.assertIsInstance(resp, dict)
 
+    def test_jobs_get_job_model(self, mocked):
+        job = {
+            "id": "job-id",
+            "status": "complete",
+            "passed": True,
+            "error": None,
+            "custom-data": {"release": "1.0"},
+            "new_field": 1,
+        }
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = json.dumps(job).encode()
+        self.sc.jobs.models = True
+
+        resp = self.sc.jobs.get_job("job-id")
+        self.assertIsInstance(resp, sauceclient.Job)
+        self.assertEqual(resp.status, "complete")
+        self.assertIsNone(resp.build)
+        self.assertIsInstance(resp._custom_data, sauceclient.LazyJSON)
+        self.assertEqual(resp.custom_data, {"release": "1.0"})
+        self.assertEqual(resp["custom-data"], {"release": "1.0"})
+        self.assertEqual(resp.get("new_field"), 1)
+        self.assertNotIn("build", resp)
+        self.assertEqual(resp, job)
+        with self.assertRaises(AttributeError):
+            resp.unknown = 1
+
     def test_jobs_update_job(self, mocked):
         mocked.return_value.status = 200
         mocked.return_value.reason = "OK"
@@ -254,6 +954,26 @@ class TestSauce(unittest.TestCase):
         )
         self.assertIsInstance(resp, dict)
 
+    def test_jobs_update_jobs(self, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = b"{}"
+
+        results, errors = self.sc.jobs.update_jobs(
+            ["job-1", {"job_id": "job-2", "passed": False}], passed=True
+        )
+        self.assertEqual(set(results), {"job-1", "job-2"})
+        self.assertEqual(errors, {})
+
+    def test_jobs_update_jobs_errors(self, mocked):
+        mocked.return_value.status = 400
+        mocked.return_value.reason = "BAD"
+
+        results, errors = self.sc.jobs.update_jobs(["job-1", "job-2"], passed=True)
+        self.assertEqual(results, {})
+        self.assertIsInstance(errors["job-1"], sauceclient.SauceException)
+        self.assertIsInstance(errors["job-2"], sauceclient.SauceException)
+
     def test_jobs_delete_job(self, mocked):
         mocked.return_value.status = 200
         mocked.return_value.reason = "OK"
@@ -270,6 +990,24 @@ class TestSauce(unittest.TestCase):
         resp = self.sc.jobs.stop_job("job-id")
         self.assertIsInstance(resp, dict)
 
+    def test_jobs_delete_jobs(self, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = b"{}"
+
+        results, errors = self.sc.jobs.delete_jobs(["job-1", "job-2"])
+        self.assertEqual(len(results), 2)
+        self.assertEqual(errors, {})
+
+    def test_jobs_stop_jobs(self, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = b"{}"
+
+        results, errors = self.sc.jobs.stop_jobs(["job-1", "job-2"], max_workers=2)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(errors, {})
+
     def test_jobs_get_job_assets(self, mocked):
         mocked.return_value.status = 200
         mocked.return_value.reason = "OK"
@@ -282,6 +1020,83 @@ class TestSauce(unittest.TestCase):
         resp = self.sc.jobs.get_job_asset_url("job-id", "0000screenshot.jpg")
         self.assertIsInstance(resp, str)
 
+    def test_jobs_download_job_asset(self, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.side_effect = [b"abc", b"def", b""]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "log.json")
+            resp = self.sc.jobs.download_job_asset("job-id", "log.json", path)
+            self.assertEqual(resp, 6)
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), b"abcdef")
+
+    def test_jobs_download_job_asset_resume(self, mocked):
+        mocked.return_value.status = 206
+        mocked.return_value.reason = "Partial Content"
+        mocked.return_value.read.side_effect = [b"def", b""]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "log.json")
+            with open(path, "wb") as f:
+                f.write(b"abc")
+            with patch("sauceclient.http_client.HTTPSConnection.request") as request:
+                resp = self.sc.jobs.download_job_asset("job-id", "log.json", path)
+            self.assertEqual(resp, 3)
+            self.assertEqual(request.call_args[1]["headers"]["Range"], "bytes=3-")
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), b"abcdef")
+
+    @patch("sauceclient.http_client.HTTPSConnection.connect")
+    def test_jobs_download_job_asset_retry(self, _, mocked):
+        self.sc.retry = sauceclient.RetryPolicy(backoff_factor=0)
+        metrics = sauceclient.RequestMetrics()
+        self.sc.hooks.append(metrics)
+        failed = MagicMock(status=429, reason="Too Many Requests")
+        failed.getheader.return_value = None
+        mocked.return_value.status = 206
+        mocked.return_value.reason = "Partial Content"
+        mocked.return_value.read.side_effect = [b"def", b""]
+        mocked.side_effect = [failed, mocked.return_value]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "log.json")
+            with open(path, "wb") as f:
+                f.write(b"abc")
+            with patch("sauceclient.http_client.HTTPSConnection.request") as request:
+                resp = self.sc.jobs.download_job_asset("job-id", "log.json", path)
+            self.assertEqual(resp, 3)
+            ranges = [call[1]["headers"]["Range"] for call in request.call_args_list]
+            self.assertEqual(ranges, ["bytes=3-", "bytes=3-"])
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), b"abcdef")
+        (stats,) = metrics.snapshot()["endpoints"]
+        self.assertEqual(
+            stats["endpoint"], "/rest/v1/{username}/jobs/job-id/assets/log.json"
+        )
+        self.assertEqual((stats["count"], stats["retries"]), (1, 1))
+        self.assertEqual(stats["bytes_received"], 3)
+
+    def test_jobs_download_job_assets(self, mocked):
+        assets = {
+            "sauce-log": "log.json",
+            "video": "video.mp4",
+            "screenshots": ["0000screenshot.png"],
+        }
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            patch.object(self.sc.jobs, "get_job_assets", return_value=assets),
+            patch.object(self.sc, "download", return_value=1) as download,
+        ):
+            results, errors = self.sc.jobs.download_job_assets(
+                ["job-1", "job-2"], tmp, assets=["sauce-log", "*.png"]
+            )
+            self.assertTrue(os.path.isdir(os.path.join(tmp, "job-1")))
+        self.assertEqual(errors, {})
+        self.assertEqual(results["job-1"], {"log.json": 1, "0000screenshot.png": 1})
+        self.assertEqual(download.call_count, 4)
+
     def test_jobs_delete_job_assets(self, mocked):
         mocked.return_value.status = 200
         mocked.return_value.reason = "OK"
@@ -290,6 +1105,15 @@ class TestSauce(unittest.TestCase):
         resp = self.sc.jobs.delete_job_assets("job-id")
         self.assertIsInstance(resp, list)
 
+    def test_jobs_delete_jobs_assets(self, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = b"[]"
+
+        results, errors = self.sc.jobs.delete_jobs_assets(["job-1", "job-2"])
+        self.assertIsInstance(results["job-1"], list)
+        self.assertEqual(errors, {})
+
     def test_jobs_get_auth_token(self, mocked):
         resp = self.sc.jobs.get_auth_token("job-id")
         self.assertIsInstance(resp, str)
@@ -305,6 +1129,90 @@ class TestSauce(unittest.TestCase):
         resp = self.sc.storage.upload_file("README.md")
         self.assertIsInstance(resp, dict)
 
+    def test_storage_upload_file_object(self, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = b"{}"
+        progress = []
+
+        with open("README.md", "rb") as f:
+            resp = self.sc.storage.upload_file(
+                f, chunk_size=100, callback=lambda *args: progress.append(args)
+            )
+            size = f.tell()
+        self.assertIsInstance(resp, dict)
+        self.assertEqual(progress[-1][:2], (size, size))
+        self.assertEqual(len(progress), -(-size // 100))
+
+    def test_storage_upload_file_iterable(self, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = b"{}"
+
+        resp = self.sc.storage.upload_file(
+            [b"abc", b"def"], filename="app.apk", length=6
+        )
+        self.assertIsInstance(resp, dict)
+
+        with self.assertRaises(ValueError):
+            self.sc.storage.upload_file([b"abc"], length=3)
+        with self.assertRaises(ValueError):
+            self.sc.storage.upload_file(io.BytesIO(b"abc"))
+
+    def test_storage_upload_file_dedup(self, mocked):
+        stored = {"name": "README.md", "md5": sauceclient.file_md5("README.md")}
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = json.dumps({"files": [stored]}).encode()
+
+        resp = self.sc.storage.upload_file("README.md", dedup=True)
+        self.assertEqual(resp, stored)
+        self.assertEqual(mocked.call_count, 1)
+
+        resp = self.sc.storage.upload_file("LICENSE", dedup=True)
+        self.assertEqual(mocked.call_count, 3)
+
+    def test_storage_digest_index(self, mocked):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.json")
+            index = sauceclient.DigestIndex(path)
+            digest = index.digest("README.md")
+            self.assertEqual(digest, sauceclient.file_md5("README.md"))
+
+            index = sauceclient.DigestIndex(path)
+            with patch("sauceclient.file_md5") as file_md5:
+                self.assertEqual(index.digest("README.md"), digest)
+            file_md5.assert_not_called()
+
+    def test_storage_upload_files(self, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = b'{"md5": "abc"}'
+
+        results = self.sc.storage.upload_files(["README.md", "LICENSE"])
+        self.assertEqual([r.path for r in results], ["README.md", "LICENSE"])
+        self.assertEqual([r.md5 for r in results], ["abc", "abc"])
+        self.assertEqual(results[0].bytes_sent, os.path.getsize("README.md"))
+        self.assertIsNone(results[0].error)
+
+    def test_storage_upload_files_retry(self, mocked):
+        failed = MagicMock(status=503, reason="Unavailable")
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = b"{}"
+        mocked.side_effect = [failed, mocked.return_value, failed, failed]
+
+        results = self.sc.storage.upload_files(
+            ["README.md", "LICENSE"], max_workers=1, retries=1, backoff=0
+        )
+        self.assertIsNone(results[0].error)
+        self.assertIsInstance(results[1].error, sauceclient.SauceException)
+
+        with patch("sauceclient.time.sleep") as sleep:
+            (result,) = self.sc.storage.upload_files(["missing.zip"], backoff=10)
+        self.assertIsInstance(result.error, FileNotFoundError)
+        sleep.assert_not_called()
+
     def test_storage_get_stored_files(self, mocked):
         mocked.return_value.status = 200
         mocked.return_value.reason = "OK"
@@ -329,6 +1237,58 @@ class TestSauce(unittest.TestCase):
         resp = self.sc.tunnels.get_tunnel("tunnel-id")
         self.assertIsInstance(resp, dict)
 
+    def test_tunnels_get_tunnel_model(self, mocked):
+        mocked.return_value.status = 200
+        mocked.return_value.reason = "OK"
+        mocked.return_value.read.return_value = b'{"id": "tunnel-id", "metadata": {}}'
+        self.sc.tunnels.models = True
+
+        resp = self.sc.tunnels.get_tunnel("tunnel-id")
+        self.assertIsInstance(resp, sauceclient.Tunnel)
+        self.assertEqual(resp.to_dict(), {"id": "tunnel-id", "metadata": {}})
+
+    def test_tunnels_fleet(self, mocked):
+        now = time.time()
+        tunnels = {
+            "t1": {"id": "t1", "owner": "a", "creation_time": now - 7200},
+            "t2": {"id": "t2", "owner": "a", "creation_time": now - 60},
+            "t3": {"id": "t3", "owner": "b", "creation_time": now - 7200},
+        }
+        fleet = sauceclient.TunnelFleet(self.sc)
+        with (
+            patch.object(self.sc.tunnels, "get_tunnels", return_value=list(tunnels)),
+            patch.object(
+                self.sc.tunnels, "get_tunnel", side_effect=tunnels.__getitem__
+            ) as get_tunnel,
+            patch.object(self.sc.tunnels, "delete_tunnel", return_value={}) as delete,
+        ):
+            self.assertEqual(len(fleet.get_tunnels()), 3)
+            self.assertEqual(len(fleet.find(owner="a")), 2)
+            self.assertEqual(get_tunnel.call_count, 3)
+            self.assertEqual([t["id"] for t in fleet.find(max_age=600)], ["t2"])
+
+            results, errors = fleet.delete_stale(3600, owner="a")
+        self.assertEqual(list(results), ["t1"])
+        self.assertEqual(errors, {})
+        delete.assert_called_once_with("t1")
+
+    def test_tunnels_fleet_errors(self, mocked):
+        def get_tunnel(tunnel_id):
+            if tunnel_id == "t1":
+                return {"id": "t1"}
+            status = 404 if tunnel_id == "t2" else 500
+            raise sauceclient.SauceException("", response=MagicMock(status=status))
+
+        fleet = sauceclient.TunnelFleet(self.sc)
+        with (
+            patch.object(self.sc.tunnels, "get_tunnels", return_value=["t1", "t2"]),
+            patch.object(self.sc.tunnels, "get_tunnel", side_effect=get_tunnel),
+        ):
+            self.assertEqual(fleet.get_tunnels(), [{"id": "t1"}])
+            self.sc.tunnels.get_tunnels.return_value = ["t1", "t2", "t3"]
+            with self.assertRaises(sauceclient.SauceException):
+                fleet.get_tunnels(refresh=True)
+
     def test_storage_delete_tunnel(self, mocked):
         mocked.return_value.status = 200
         mocked.return_value.reason = "OK"
@@ -338,5 +1298,204 @@ class TestSauce(unittest.TestCase):
         self.assertIsInstance(resp, dict)
 
 
+def make_stream(data):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    writer = MagicMock()
+    writer.drain = AsyncMock()
+    return reader, writer
+
+
+class TestAsyncSauce(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.sc = sauceclient.AsyncSauceClient("sauce-username", "sauce-access-key")
+
+    async def test_read_http_response(self):
+        reader, _ = make_stream(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}")
+        response, data = await sauceclient.read_http_response(reader)
+        self.assertEqual(response.status, 200)
+        self.assertFalse(response.will_close)
+        self.assertEqual(data, b"{}")
+
+    async def test_read_http_response_chunked(self):
+        reader, _ = make_stream(
+            b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"1\r\n[\r\n1\r\n]\r\n0\r\n\r\n"
+        )
+        _, data = await sauceclient.read_http_response(reader)
+        self.assertEqual(data, b"[]")
+
+    async def test_bad_request(self):
+        stream = make_stream(b"HTTP/1.1 400 BAD\r\nContent-Length: 0\r\n\r\n")
+        with patch.object(
+            self.sc.pool, "new_connection", AsyncMock(return_value=stream)
+        ):
+            with self.assertRaises(sauceclient.SauceException):
+                await self.sc.information.get_status()
+
+    async def test_jobs_update_job(self):
+        stream = make_stream(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}")
+        with patch.object(
+            self.sc.pool, "new_connection", AsyncMock(return_value=stream)
+        ):
+            resp = await self.sc.jobs.update_job("job-id", passed=True)
+        self.assertIsInstance(resp, dict)
+        request = stream[1].write.call_args[0][0]
+        self.assertTrue(request.startswith(b"PUT /rest/v1/sauce-username/jobs/job-id "))
+        self.assertTrue(request.endswith(b'{"passed": true}'))
+        self.assertEqual(len(self.sc.pool._idle), 1)
+
+    async def test_compression(self):
+        body = gzip.compress(b'{"id": "job-id"}')
+        stream = make_stream(
+            b"HTTP/1.1 200 OK\r\nContent-Encoding: gzip\r\n"
+            b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+        )
+        with patch.object(
+            self.sc.pool, "new_connection", AsyncMock(return_value=stream)
+        ):
+            resp = await self.sc.jobs.get_job("job-id")
+        self.assertEqual(resp, {"id": "job-id"})
+        request = stream[1].write.call_args[0][0]
+        self.assertEqual(request.count(b"Accept-Encoding:"), 1)
+        self.assertIn(b"Accept-Encoding: gzip, deflate\r\n", request)
+
+    async def test_information_get_platform_catalog(self):
+        platforms = [{"api_name": "chrome", "os": "Mac 13", "short_version": "122"}]
+
+        async def request(method, endpoint):
+            return {} if endpoint.endswith("/eol") else platforms
+
+        with patch.object(self.sc, "request", side_effect=request):
+            catalog = await self.sc.information.get_platform_catalog()
+            self.assertEqual(catalog.latest("chrome")[0].short_version, "122")
+            catalog = await self.sc.information.get_platform_catalog(drop_eol=False)
+            self.assertEqual(len(catalog), 1)
+
+    async def test_analytics_iter_tests(self):
+        tests = [
+            {"id": f"test-{hour}", "creation_time": f"1976-10-12T{hour:02}:30:00Z"}
+            for hour in range(24)
+        ]
+
+        async def get_tests(start, end, size, skip, **filters):
+            items = [t for t in tests if start <= t["creation_time"] <= end]
+            return {
+                "items": items[skip : skip + size],
+                "has_more": skip + size < len(items),
+            }
+
+        with patch.object(self.sc.analytics, "get_tests", side_effect=get_tests):
+            items = self.sc.analytics.iter_tests(
+                "1976-10-12T00:00:00Z", "1976-10-13T00:00:00Z", shards=5, size=2
+            )
+            resp = [item async for item in items]
+        self.assertEqual(resp, tests)
+
+    async def test_jobs_update_jobs(self):
+        failed = sauceclient.SauceException("400: BAD")
+        request = AsyncMock(side_effect=[{"id": "job-1"}, failed])
+        with patch.object(self.sc, "request", request):
+            results, errors = await self.sc.jobs.update_jobs(
+                ["job-1", "job-2"], max_workers=1, passed=True
+            )
+        self.assertEqual(results, {"job-1": {"id": "job-1"}})
+        self.assertEqual(errors, {"job-2": failed})
+        self.assertEqual(request.call_count, 2)
+
+    async def test_jobs_download_job_assets(self):
+        stream = make_stream(b"HTTP/1.1 200 OK\r\nContent-Length: 6\r\n\r\nabcdef")
+        get_job_assets = AsyncMock(return_value={"sauce-log": "log.json"})
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            patch.object(self.sc.jobs, "get_job_assets", get_job_assets),
+            patch.object(
+                self.sc.pool, "new_connection", AsyncMock(return_value=stream)
+            ),
+        ):
+            results, errors = await self.sc.jobs.download_job_assets(["job-1"], tmp)
+            with open(os.path.join(tmp, "job-1", "log.json"), "rb") as f:
+                self.assertEqual(f.read(), b"abcdef")
+        self.assertEqual(errors, {})
+        self.assertEqual(results, {"job-1": {"log.json": 6}})
+        request = stream[1].write.call_args[0][0]
+        self.assertIn(b"Accept-Encoding: identity\r\n", request)
+
+    async def test_jobs_iter_jobs(self):
+        jobs = [{"id": f"job-{i}"} for i in range(7)]
+
+        async def get_jobs(limit, skip, **kwargs):
+            return jobs[skip : skip + limit]
+
+        with patch.object(self.sc.jobs, "get_jobs", side_effect=get_jobs):
+            resp = [job async for job in self.sc.jobs.iter_jobs(page_size=3)]
+        self.assertEqual(resp, jobs)
+
+    async def test_jobs_job_watcher(self):
+        sync_client = sauceclient.SauceClient("sauce-username", "sauce-access-key")
+        watcher = sauceclient.JobWatcher(sync_client, ["job-1"], interval=0.01)
+        pages = [[{"id": "job-1"}], [{"id": "job-1", "status": "complete"}]]
+        with patch.object(sync_client.jobs, "get_jobs", side_effect=pages):
+            resp = [job async for job in watcher]
+        self.assertEqual(resp, [{"id": "job-1", "status": "complete"}])
+
+    async def test_storage_upload_file(self):
+        stream = make_stream(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}")
+        new_connection = AsyncMock(return_value=stream)
+        with patch.object(self.sc.pool, "new_connection", new_connection):
+            resp = await self.sc.storage.upload_file("README.md", chunk_size=100)
+        self.assertIsInstance(resp, dict)
+        sent = b"".join(call[0][0] for call in stream[1].write.call_args_list)
+        with open("README.md", "rb") as f:
+            self.assertTrue(sent.endswith(f.read()))
+
+        with patch.object(self.sc, "request", AsyncMock()) as request:
+            with self.assertRaises(TypeError):
+                self.sc.storage.upload_file("README.md", dedup=True)
+            with self.assertRaises(TypeError):
+                self.sc.storage.upload_files(["README.md"], dedup=True)
+        request.assert_not_called()
+
+    async def test_storage_upload_files(self):
+        def new_connection():
+            return make_stream(
+                b'HTTP/1.1 200 OK\r\nContent-Length: 14\r\n\r\n{"md5": "abc"}'
+            )
+
+        with patch.object(
+            self.sc.pool, "new_connection", AsyncMock(side_effect=new_connection)
+        ):
+            results = await self.sc.storage.upload_files(
+                ["README.md", "LICENSE", "missing.zip"], max_workers=2
+            )
+        self.assertEqual([r.md5 for r in results], ["abc", "abc", None])
+        self.assertEqual(results[1].bytes_sent, os.path.getsize("LICENSE"))
+        self.assertIsInstance(results[2].error, FileNotFoundError)
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_run_benchmarks(self):
+        results = benchmark_sauceclient.run_benchmarks(
+            ["rate_limited", "pagination", "upload", "download"],
+            iterations=20,
+            jobs=150,
+            asset_size=64 * 1024,
+        )
+        json.dumps(results)
+        names = [result["name"] for result in results["benchmarks"]]
+        self.assertEqual(names, ["rate_limited", "pagination", "upload", "download"])
+        for result in results["benchmarks"]:
+            self.assertEqual(result["errors"], 0)
+            self.assertGreater(result["ops_per_second"], 0)
+        self.assertGreater(results["metrics"]["endpoints"][0]["retries"], 0)
+
+        self.assertEqual(benchmark_sauceclient.compare(results, results), [])
+        baseline = json.loads(json.dumps(results))
+        baseline["benchmarks"][0]["ops_per_second"] *= 2
+        (regression,) = benchmark_sauceclient.compare(results, baseline)
+        self.assertTrue(regression.startswith("rate_limited:"))
+
+
 if __name__ == "__main__":
     unittest.main()